@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: compression.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+transparent compression of large json payloads.
+
+Payloads above compress_threshold are compressed and wrapped into a small json object tagged
+with COMPRESSION_MARKER, the receiver detects the marker and decompresses.
+A threshold of 0 disables compression, set it with CLUPLUS_COMPRESS_THRESHOLD or at runtime.
+'''
+
+from __future__ import annotations
+
+import os
+import bz2
+import json
+import lzma
+import zlib
+
+from base64 import b64encode, b64decode
+
+
+COMPRESSION_MARKER = "cluplus/z"
+
+codecs = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+compress_threshold = int(os.getenv("CLUPLUS_COMPRESS_THRESHOLD", 0))
+compress_codec = os.getenv("CLUPLUS_COMPRESS_CODEC", "zlib")
+
+
+def _envelope(value):
+    # the codec spec of a compressed payload or None,
+    # user json with a key starting with the marker or more keys is not a compressed payload.
+    if not (isinstance(value, str) and value.lstrip("'").startswith('{"' + COMPRESSION_MARKER + '"')):
+        return None
+    try:
+        envelope = json.loads(value.strip("'"))
+    except ValueError:
+        return None
+    if not isinstance(envelope, dict) or len(envelope) != 1:
+        return None
+    spec = envelope[COMPRESSION_MARKER]
+    if not isinstance(spec, dict) or not isinstance(spec.get("codec"), str) or not isinstance(spec.get("b64"), str):
+        return None
+    return spec
+
+
+def _decompress(spec: dict) -> str:
+    try:
+        return codecs[spec["codec"]][1](b64decode(spec["b64"], validate=True)).decode()
+    except Exception as ex:
+        # zlib.error, lzma.LZMAError, OSError of bz2, unknown codecs, bad base64 or utf-8
+        raise ValueError(f"invalid compressed payload: {type(ex).__name__} {ex}") from ex
+
+
+def is_compressed(value) -> bool:
+    '''
+    checks if value is a compressed payload, quoted or not.
+    '''
+    return _envelope(value) is not None
+
+
+def compress(payload: str, codec: str = None) -> str:
+    '''
+    compresses payload and returns the tagged json string.
+    '''
+    codec = codec or compress_codec
+    data = b64encode(codecs[codec][0](payload.encode())).decode("ascii")
+    return json.dumps({COMPRESSION_MARKER: {"codec": codec, "b64": data}})
+
+
+def decompress(value: str) -> str:
+    '''
+    decompresses a tagged json string, raises ValueError if it is not a valid compressed payload.
+    '''
+    spec = _envelope(value)
+    if spec is None:
+        raise ValueError("not a compressed payload")
+    return _decompress(spec)
+
+
+def maybe_compress(payload: str) -> str:
+    '''
+    compresses payload if above the threshold.
+    '''
+    if compress_threshold and len(payload) >= compress_threshold:
+        return compress(payload)
+    return payload
+
+
+def maybe_decompress(value: str) -> str:
+    '''
+    decompresses value if tagged.
+    '''
+    spec = _envelope(value)
+    return _decompress(spec) if spec is not None else value
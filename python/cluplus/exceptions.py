@@ -26,3 +26,13 @@ class ProxyUnpackKeysNotAllFoundException(ProxyException):
     """More than one provided unpack filter keys not found"""
 
     pass
+
+class ProxySharedMemoryException(ProxyException, ValueError):
+    """Shared memory payload not reachable, a ValueError like other undecodable arguments"""
+
+    pass
+
+class ProxyCommandArgumentsException(ProxyException):
+    """The command arguments do not match the command signature"""
+
+    pass
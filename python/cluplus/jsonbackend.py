@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: jsonbackend.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+pluggable json backend for argument encoding and decoding.
+
+Uses orjson, simdjson or ujson for decoding when installed, the stdlib json otherwise.
+Encoding stays with the stdlib json, the fast encoders differ in separators, float formatting and
+the types they accept, so the wire format does not depend on the installed packages.
+Select it with CLUPLUS_JSON_BACKEND or use(name), "auto" picks the fastest installed one.
+Everything a fast backend cannot handle (big integers, NaN with orjson, ...) falls back to the stdlib json,
+so the decoded data is always the same.
+'''
+
+from __future__ import annotations
+
+import os
+import json
+
+from typing import Callable
+
+
+def _std_dumps(obj) -> str:
+    return json.dumps(obj)
+
+
+def _with_fallback(fast: Callable, slow: Callable) -> Callable:
+    def call(x):
+        try:
+            return fast(x)
+        except (TypeError, ValueError, OverflowError, RuntimeError):
+            return slow(x)
+    return call
+
+
+# name: (dumps, loads), None means stdlib json for that direction.
+backends = {"json": (_std_dumps, json.loads)}
+
+try:
+    import orjson
+    # orjson writes NaN as null, so encoding stays with the stdlib.
+    backends["orjson"] = (None, orjson.loads)
+except ImportError:
+    pass
+
+try:
+    import simdjson
+    backends["simdjson"] = (None, simdjson.loads)
+except ImportError:
+    pass
+
+try:
+    import ujson
+    backends["ujson"] = (None, ujson.loads)
+except ImportError:
+    pass
+
+
+dumps = _std_dumps
+loads = json.loads
+backend = "json"
+
+
+def register_backend(name: str, dumps: Callable = None, loads: Callable = None):
+    '''
+    registers a backend, dumps or loads None use the stdlib json.
+    '''
+    backends[name] = (dumps, loads)
+
+
+def use(name: str = "auto"):
+    '''
+    selects the json backend by name, "auto" uses the fastest installed one.
+    '''
+    global dumps, loads, backend
+
+    if name == "auto":
+        fast_dumps = None
+        fast_loads = next((backends[n][1] for n in ("orjson", "simdjson", "ujson") if n in backends), None)
+    elif name in backends:
+        fast_dumps, fast_loads = backends[name]
+    else:
+        raise ValueError(f"unknown json backend {name}, available {list(backends)}")
+
+    dumps = _with_fallback(fast_dumps, _std_dumps) if fast_dumps and fast_dumps is not _std_dumps else _std_dumps
+    loads = _with_fallback(fast_loads, json.loads) if fast_loads and fast_loads is not json.loads else json.loads
+    backend = name
+
+
+use(os.getenv("CLUPLUS_JSON_BACKEND", "auto"))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: offload.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+size aware offload of command argument decoding to an executor.
+
+Only arguments are offloaded: the click converters with offload=True and unpickle_async.
+Reply bodies are json decoded by clu in AMQPReply before a proxy sees them, the proxy
+reply handlers have nothing left to offload.
+
+Payloads of at least offload_threshold characters are decoded in an executor and awaited,
+smaller ones are decoded inline. A threshold of 0 disables offloading, set it with
+CLUPLUS_OFFLOAD_THRESHOLD or at runtime. use("process") decodes in a process pool, it is not
+limited by the GIL but the decoded data has to be pickled back.
+'''
+
+from __future__ import annotations
+
+import os
+import asyncio
+
+from typing import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+
+offload_threshold = int(os.getenv("CLUPLUS_OFFLOAD_THRESHOLD", 1 << 20))
+
+# None is the default thread pool of the event loop.
+executor = None
+_process_pool = None
+
+
+def use(kind = "thread", max_workers:int = None):
+    '''
+    selects the executor, "thread", "process" or an Executor instance.
+    '''
+    global executor, _process_pool
+
+    if _process_pool:
+        _process_pool.shutdown(wait=False)
+        _process_pool = None
+
+    if isinstance(kind, Executor):
+        executor = kind
+    elif kind == "thread":
+        executor = None
+    elif kind == "process":
+        executor = _process_pool = ProcessPoolExecutor(max_workers)
+    else:
+        raise ValueError(f"unknown executor {kind}, use thread, process or an Executor")
+
+
+def should_offload(payload) -> bool:
+    '''
+    checks if payload is large enough to be decoded in the executor.
+    '''
+    return bool(offload_threshold) and len(payload) >= offload_threshold
+
+
+async def run(decode: Callable, payload):
+    '''
+    returns decode(payload), decoded in the executor if payload is large.
+    '''
+    if should_offload(payload):
+        return await asyncio.get_running_loop().run_in_executor(executor, decode, payload)
+    return decode(payload)
+
+
+def submit(decode: Callable, payload, on_error: Callable = None) -> asyncio.Future:
+    '''
+    like run for sync code called from the event loop, eg: click converters, returns a future.
+
+    Small payloads raise decode errors at once, large ones when awaited,
+    on_error maps a ValueError of an offloaded decode to the exception raised instead.
+    '''
+    loop = asyncio.get_event_loop()
+    if not should_offload(payload):
+        fu = loop.create_future()
+        fu.set_result(decode(payload))
+        return fu
+
+    fu = loop.run_in_executor(executor, decode, payload)
+    if on_error is None:
+        return fu
+
+    mapped = loop.create_future()
+
+    def done(fu):
+        if mapped.cancelled():
+            return
+        if fu.cancelled():
+            mapped.cancel()
+        elif isinstance(fu.exception(), ValueError):
+            mapped.set_exception(on_error(fu.exception()))
+        elif fu.exception() is not None:
+            mapped.set_exception(fu.exception())
+        else:
+            mapped.set_result(fu.result())
+
+    fu.add_done_callback(done)
+    return mapped
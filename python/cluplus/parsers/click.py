@@ -8,18 +8,66 @@
 from __future__ import annotations
 
 import os
+import json
+import asyncio
+from socket import gethostname
 
 import click
+from clu.command import Command, CommandStatus
 from clu.parsers.click import command_parser
 
+from cluplus.signatures import command_signature
+
 
 @command_parser.command(name='__commands')
+@click.option("--signatures", is_flag=True, default=False, help="Returns the command signatures as json strings.")
 @click.pass_context
-def __commands(ctx, command: Command, *args):
+def __commands(ctx, command: Command, *args, signatures: bool = False):
     """Returns all commands."""
 
+    commands = {k: v for k, v in ctx.command.commands.items() if k[:2] != '__'}
+
     # we have to use the help key for the command list, dont want to change the standard model.
-    command.finish(help=[k for k in ctx.command.commands.keys() if k[:2] != '__'])
+    command.finish(help=[json.dumps(command_signature(k, v)) for k, v in commands.items()] if signatures else list(commands),
+                   version=str(command.actor.version))
+
+
+@command_parser.command(name='__host')
+def __host(command: Command, *args):
+    """Returns the actor host, used for shared memory transport."""
+
+    command.finish(text=gethostname())
+
+
+@command_parser.command(name='__batch')
+@click.argument("COMMANDS", nargs=-1)
+@click.option("--concurrent", is_flag=True, default=False, help="Runs the commands concurrently.")
+async def __batch(command: Command, *args, commands: tuple = (), concurrent: bool = False):
+    """Runs many commands, returns a json string per command with its status and final reply."""
+
+    async def run(command_string):
+        # silent sub commands, their replies are only recorded.
+        sub = Command(command_string, actor=command.actor, commander_id=command.commander_id, silent=True).parse()
+        await sub
+        name = command_string.split(" ", 1)[0]
+        try:
+            return json.dumps({"command": name,
+                               "status": sub.status.name,
+                               "reply": sub.replies[-1].message if sub.replies else {}})
+        except (TypeError, ValueError) as ex:
+            # only this entry fails, the other replies are returned.
+            error = {"exception_module": ex.__class__.__module__,
+                     "exception_type": ex.__class__.__name__,
+                     "exception_message": f"reply not serializable: {ex}"}
+            return json.dumps({"command": name, "status": CommandStatus.FAILED.name, "reply": {"error": error}})
+
+    if concurrent:
+        results = await asyncio.gather(*[run(c) for c in commands])
+    else:
+        results = [await run(c) for c in commands]
+
+    # like __commands we use the help key, so the standard model does not change.
+    command.finish(help=list(results))
 
 
 #@command_parser.command(name='foo')
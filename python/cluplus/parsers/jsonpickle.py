@@ -11,41 +11,170 @@
 
 from __future__ import annotations
 
+import os
+import asyncio
+
 import click
 from clu.command import Command
 from clu.parsers.click import command_parser
 
 import jsonpickle
+from jsonpickle.handlers import BaseHandler
+from jsonpickle.unpickler import Unpickler, loadclass
+from jsonpickle.util import importable_name
+from base64 import b64encode, b64decode
+from numpy.lib.format import dtype_to_descr, descr_to_dtype
 import numpy as np
 
+from cluplus import shm, compression, offload
+from cluplus.exceptions import ProxySharedMemoryException
+
+
+class NDArrayBinaryHandler(BaseHandler):
+    '''
+    jsonpickle handler for numpy arrays, encodes the raw buffer as base64 with a dtype/shape/order header.
+
+    Structured and record arrays are supported, object arrays fall back to a list of flattened values.
+    Other ndarray subclasses, eg: masked arrays, keep the generic jsonpickle encoding.
+    '''
+
+    def flatten(self, obj, data):
+        data["dtype"] = dtype_to_descr(obj.dtype) if not obj.dtype.hasobject else "object"
+        data["shape"] = list(obj.shape)
+        if obj.dtype.hasobject:
+            data["values"] = [self.context.flatten(v, reset=False) for v in obj.ravel()]
+            return data
+        order = "F" if obj.flags.f_contiguous and not obj.flags.c_contiguous else "C"
+        data["order"] = order
+        data["b64"] = b64encode(np.ravel(obj, order=order).view(np.uint8)).decode("ascii")
+        return data
+
+    def restore(self, data):
+        cls = loadclass(data["py/object"]) or np.ndarray
+        shape = tuple(data["shape"])
+        if data["dtype"] == "object":
+            arr = np.empty(len(data["values"]), dtype=object)
+            for i, v in enumerate(data["values"]):
+                arr[i] = self.context.restore(v, reset=False)
+            return arr.reshape(shape).view(cls)
+        dtype = descr_to_dtype(data["dtype"])
+        # a bytearray buffer keeps the decoded array writable like the generic encoding.
+        arr = np.frombuffer(bytearray(b64decode(data["b64"])), dtype=dtype)
+        return arr.reshape(shape, order=data["order"]).view(cls)
+
+
+def register_ndarray_handlers():
+    '''
+    enables the binary ndarray encoding, all peers need cluplus with the binary handler to decode it.
+    '''
+    # not registered as base, subclasses with extra state like np.ma.MaskedArray would lose it.
+    for cls in (np.ndarray, np.recarray):
+        jsonpickle.handlers.register(cls, NDArrayBinaryHandler)
+
+
+def unregister_ndarray_handlers():
+    '''
+    falls back to the generic jsonpickle ndarray encoding, the default, binary payloads are still decoded.
+    '''
+    for cls in (np.ndarray, np.recarray):
+        jsonpickle.handlers.unregister(cls)
+
+
+_binary_names = {importable_name(np.ndarray), importable_name(np.recarray)}
+
+
+class _Unpickler(Unpickler):
+    # decodes binary ndarrays of peers whether the encoding is enabled or not.
+    def _restore_object(self, obj):
+        if obj.get("py/object") in _binary_names and "dtype" in obj and "shape" in obj:
+            return self._mkref(NDArrayBinaryHandler(self).restore(obj))
+        return super()._restore_object(obj)
+
+
+# opt-in, peers without the binary handler would decode the arrays silently into dicts.
+binary_ndarrays = bool(int(os.getenv("CLUPLUS_BINARY_NDARRAYS", 0)))
+
+if binary_ndarrays:
+    register_ndarray_handlers()
+else:
+    unregister_ndarray_handlers()
+
 
 class JsonPickleParamType(click.ParamType):
     name = "jsonpickle"
 
+    def __init__(self, offload:bool = False):
+        """With offload the value is a future, large payloads are decoded in the offload executor,
+        a malformed one raises click.BadParameter when awaited.
+
+        >>> @click.argument("data", type=JsonPickleParamType(offload=True))
+        ... async def bigData(command: Command, data):
+        ...     data = await data
+        """
+        self.offload = offload
+
     def convert(self, value, param, ctx):
         try:
-            return jsonpickle.decode(value)
+            # the payload is never echoed in errors, only the value received.
+            payload = shm.shm_get(value) if shm.is_shm_handle(value) else value
+            if self.offload:
+                # a malformed large payload is a usage error too, raised when awaited.
+                return offload.submit(_loads, payload,
+                                      lambda ex: click.BadParameter(f"{value!r} is not a valid jsonpickle", ctx, param))
+            return _loads(payload)
+        except ProxySharedMemoryException as ex:
+            self.fail(str(ex), param, ctx)
         except ValueError:
             self.fail(f"{value!r} is not a valid jsonpickle", param, ctx)
 
 
-def pickle(*argv):
+def _encode(a, use_shm=False):
+    data = compression.maybe_compress(jsonpickle.encode(a, make_refs=False))
+    if use_shm and len(data) >= shm.shm_threshold:
+        data = shm.shm_put(data)
+    return "'" + data + "'"
+
+
+def _loads(a):
+    return jsonpickle.decode(compression.maybe_decompress(a), context=_Unpickler())
+
+
+def _decode(a):
+    return _loads(shm.shm_get(a) if shm.is_shm_handle(a) else a[1:-1])
+
+
+def pickle(*argv, use_shm:bool=False):
     '''
     converts single or multiple data to a quoted json string.
+
+    Payloads above compression.compress_threshold are compressed.
+    With use_shm large payloads are put into shared memory and only a handle is returned,
+    this works only if the receiver runs on the same host.
+    With CLUPLUS_BINARY_NDARRAYS=1 or register_ndarray_handlers() numpy arrays are sent as base64 buffers.
     '''
     if(len(argv) > 1):
-        return ["'" + jsonpickle.encode(a, make_refs=False) + "'" for a in argv]
+        return [_encode(a, use_shm) for a in argv]
     else:
-        return "'" + jsonpickle.encode(argv[0], make_refs=False) + "'"
+        return _encode(argv[0], use_shm)
 
 def unpickle(*argv):
     '''
     converts single or multiple data to a quoted json string.
     '''
     if(len(argv) > 1):
-        return [jsonpickle.decode(a[1:-1]) for a in argv]
+        return [_decode(a) for a in argv]
+    else:
+        return _decode(argv[0])
+
+async def unpickle_async(*argv):
+    '''
+    like unpickle, payloads above offload.offload_threshold are decoded in the offload executor.
+    '''
+    ret = await asyncio.gather(*[offload.run(_loads, shm.shm_get(a) if shm.is_shm_handle(a) else a[1:-1]) for a in argv])
+    if(len(argv) > 1):
+        return ret
     else:
-        return jsonpickle.decode(argv[0][1:-1])
+        return ret[0]
 
 
 
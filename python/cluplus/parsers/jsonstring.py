@@ -15,14 +15,34 @@ import click
 from clu.command import Command
 from clu.parsers.click import command_parser
 
-import json
+from cluplus import shm, compression, jsonbackend, offload
+from cluplus.exceptions import ProxySharedMemoryException
+
+
+def _loads(value):
+    return jsonbackend.loads(compression.maybe_decompress(value))
+
 
 class JsonStringParamType(click.ParamType):
     name = "jsonstring"
 
+    def __init__(self, offload:bool = False):
+        """With offload the value is a future, large payloads are decoded in the offload executor,
+        a malformed one raises click.BadParameter when awaited."""
+        self.offload = offload
+
     def convert(self, value, param, ctx):
         try:
-            return json.loads(value)
-        
+            # the payload is never echoed in errors, only the value received.
+            payload = shm.shm_get(value) if shm.is_shm_handle(value) else value
+            if self.offload:
+                # a malformed large payload is a usage error too, raised when awaited.
+                return offload.submit(_loads, payload,
+                                      lambda ex: click.BadParameter(f"{value!r} is not a valid json string", ctx, param))
+            return _loads(payload)
+
+        except ProxySharedMemoryException as ex:
+            self.fail(str(ex), param, ctx)
+
         except ValueError:
             self.fail(f"{value!r} is not a valid json string", param, ctx)
@@ -8,37 +8,148 @@
 
 from __future__ import annotations
 
+import re
 import sys
 import uuid
 import os
 import fnmatch
+import hashlib
+import random
 
 import asyncio
+import threading
+import concurrent.futures
 from os.path import basename
 from socket import gethostname
 
-from functools import partial
+from math import ceil
+from time import monotonic
+from copy import deepcopy
+from functools import partial, lru_cache
+from contextlib import suppress
 from itertools import chain
 from typing import Callable, Optional
-from collections.abc import MutableMapping
+from collections import deque, defaultdict, OrderedDict
+from collections.abc import Mapping, MutableMapping
 
 from shlex import quote
 import json
 
-from inspect import getcoroutinelocals, iscoroutine
+from inspect import getcoroutinelocals, getcoroutinestate, iscoroutine, CORO_CLOSED
 from clu import AMQPClient, AMQPReply, BaseClient, CommandStatus
+from clu.protocol import TopicListener, apika
+
+from . import shm, compression, jsonbackend
+from .signatures import compile_encoder
+from .schemas import compile_decoder
+from .exceptions import ProxyException, ProxyPartialInvokeException, ProxyActorIsNotReachableException, ProxyUnpackKeysNotAllFoundException
+
+def _catalogue_hash(commands, signatures = None):
+    return hashlib.sha1(json.dumps([sorted(commands), signatures], sort_keys=True).encode()).hexdigest()
 
-from .exceptions import ProxyPartialInvokeException, ProxyActorIsNotReachableException, ProxyUnpackKeysNotAllFoundException
 
 class Client(AMQPClient):
     """An amqpc client with enviroment support.
+
+    With pool_size > 1 commands are published over a pool of connections, an actor is assigned
+    to a connection by hashing its name or, with pool_strategy "least_loaded", to the connection
+    with the fewest running commands. All replies are received by the one replies queue.
     """
-    def __init__(self, **kwargs):
+    def __init__(self, pool_size:int = None, pool_strategy:str = "hash", **kwargs):
         """ init """
 
         kwargs = {"url": os.getenv("RMQ_URL", None), "host": os.getenv("RMQ_HOST", "localhost"), **kwargs}
         name = f"{gethostname()}_{basename(sys.argv[0])}-{uuid.uuid4().hex[:8]}"
         AMQPClient.__init__(self, name=name, **kwargs)
+        self.sender_callbacks = {}
+
+        if pool_strategy not in ("hash", "least_loaded"):
+            raise ValueError(f"unknown pool_strategy {pool_strategy}, use hash or least_loaded")
+        self.pool_size = max(1, pool_size or int(os.getenv("CLUPLUS_POOL_SIZE", 1)))
+        self.pool_strategy = pool_strategy
+        self.lanes = [self.connection]
+        self.lane_load = [0]
+
+    async def start(self, exchange_name:str = AMQPClient.__EXCHANGE_NAME__):
+        """Starts the connection and the connection pool."""
+
+        await AMQPClient.start(self, exchange_name)
+
+        c = self.connection
+        self.lanes = [c]
+        for i in range(1, self.pool_size):
+            lane = TopicListener(url=c.url, user=c.user, password=c.password, host=c.host,
+                                 port=c.port, virtualhost=c.virtualhost, ssl=c.ssl)
+            self.lanes.append(await lane.connect(exchange_name))
+        self.lane_load = [0] * len(self.lanes)
+
+        return self
+
+    async def stop(self):
+        """Closes the connection pool and the connection."""
+
+        for lane in self.lanes[1:]:
+            if lane.connection and not lane.connection.is_closed:
+                await lane.connection.close()
+        self.lanes = [self.connection]
+        self.lane_load = [0]
+
+        await AMQPClient.stop(self)
+
+    def _select_lane(self, consumer:str):
+        if len(self.lanes) == 1:
+            return 0
+        if self.pool_strategy == "least_loaded":
+            return min(range(len(self.lanes)), key=self.lane_load.__getitem__)
+        return hash(consumer) % len(self.lanes)
+
+    def _release_lane(self, lane:int):
+        if lane < len(self.lane_load):
+            self.lane_load[lane] -= 1
+
+    async def _publish_message(self, consumer:str, headers:dict = {}, body:dict = {}, correlation_id:str = None):
+        """Publishes a command over a connection of the pool, replies go to the replies queue."""
+
+        if len(self.lanes) == 1:
+            return await AMQPClient._publish_message(self, consumer, headers, body, correlation_id)
+
+        lane = self._select_lane(consumer)
+        self.lane_load[lane] += 1
+        command = self.running_commands.get(correlation_id)
+        if command is not None:
+            command.add_done_callback(lambda _: self._release_lane(lane))
+
+        try:
+            await self.lanes[lane].exchange.publish(
+                apika.Message(json.dumps(body).encode(),
+                              content_type="text/json",
+                              headers=headers,
+                              correlation_id=correlation_id,
+                              reply_to=self.replies_queue.name),
+                routing_key=f"command.{consumer}")
+
+        except (apika.exceptions.DeliveryError, apika.exceptions.PublishError):
+            # like clu, fake a failed reply of the not connected actor.
+            headers.update({"message_code": "f", "sender": consumer})
+            await self.lanes[lane].exchange.publish(
+                apika.Message(json.dumps(dict(error=f"Failed routing message to consumer {consumer!r}.")).encode(),
+                              content_type="text/json",
+                              headers=headers,
+                              correlation_id=correlation_id),
+                routing_key=f"reply.{self.name}")
+
+        finally:
+            if command is None:
+                self._release_lane(lane)
+
+    async def handle_reply(self, message):
+        """Handles a reply and notifies the callbacks registered for its sender."""
+
+        reply = await AMQPClient.handle_reply(self, message)
+        if reply.is_valid:
+            for cb in list(self.sender_callbacks.get(reply.sender, ())):
+                cb()
+        return reply
 
 
 class Proxy():
@@ -47,18 +158,58 @@ class Proxy():
    
     __commands = "__commands"
     __commands_key = "help"
+    __host = "__host"
+    __batch = "__batch"
     __pull_commands_task = "_pull_commands_task"
     
     __amqpc = None
 
     pull_commands_delay = 2
+    pull_commands_delay_max = 30
     pull_commands_attempts = 42
 
-    def __init__(self, actor:str, amqpc:BaseClient = None, **kwargs):
-        """ init """
+    # directory for the on-disk command cache, disabled if None.
+    commands_cache = os.getenv("CLUPLUS_COMMANDS_CACHE", None)
+
+    # set to ProxyDict below its definition.
+    reply_type = None
+
+    # reply decoders compiled from the actor schemas, fetched once per actor version and catalogue.
+    schema_decoders = {}
+    __get_schema = "get_schema"
+
+    # actors without command signatures and their version, asked again only after a version change.
+    unsigned_actors = {}
+
+    def __init__(self, actor:str, amqpc:BaseClient = None, use_shm:bool = False, coalesce = (),
+                 cache:dict = None, cache_size:int = 256, compact:bool = False, typed:bool = False, **kwargs):
+        """ init
+
+        With use_shm large json arguments are passed via shared memory if the actor runs on the same host.
+        Concurrent calls of the commands in coalesce with the same arguments share one actor command,
+        replies of the commands in cache are reused for the given seconds, eg: cache={"status": 0.5}.
+        Only use both for read-only commands.
+        With compact replies are read only CompactProxyDict objects, eg: for large reply histories.
+        With typed the reply values are decoded with the actor schema, eg: numeric lists to numpy arrays.
+        """
 
         self.actor = actor
         self.amqpc = amqpc
+        self.use_shm = use_shm
+        if compact:
+            self.reply_type = CompactProxyDict
+        self.typed = typed
+        self._decoder = None
+        self.coalesce = set(coalesce)
+        self.reply_cache = ReplyCache(cache or {}, cache_size)
+        self._inflight = {}
+        self._actor_host = None
+        self._commands = []
+        self._encoders = {}
+        self._revalidate_commands_task = None
+        self._ready_result = None
+        self._ready_future = None
+        self.stream = ProxyStreams(self)
 
         if not self.amqpc:
             if Proxy.__amqpc:
@@ -77,15 +228,49 @@ class Proxy():
         if not self.isAmqpcConnected():
             await self.amqpc.start()
 
-        await self._pull_commands()
+        if self._ready_result is not True:
+            self._ready_result = None
+            if self._ready_future and self._ready_future.done():
+                self._ready_future = None
+
+        if self._load_commands_cache():
+            self._revalidate_commands_task = self.amqpc.loop.create_task(self._pull_commands())
+        else:
+            await self._pull_commands()
    
         return self
 
 
     async def stop(self):
         """stop actor"""
+        if self._revalidate_commands_task:
+            self._revalidate_commands_task.cancel()
+            self._revalidate_commands_task = None
         await self.__delattr_pull_commands_task(cancel=True)
 
+    async def ready(self, timeout:float = None):
+        """Wait until the actor commands are pulled.
+
+        Raises ProxyActorIsNotReachableException if all connect attempts failed.
+        """
+        if self._ready_result is True:
+            return self
+        if isinstance(self._ready_result, Exception):
+            raise self._ready_result
+        if not self._ready_future:
+            self._ready_future = asyncio.get_running_loop().create_future()
+        return await asyncio.wait_for(asyncio.shield(self._ready_future), timeout)
+
+    def _set_ready(self, result):
+        if self._ready_result is True:
+            return
+        self._ready_result = result
+        if self._ready_future and not self._ready_future.done():
+            if result is True:
+                self._ready_future.set_result(self)
+            else:
+                self._ready_future.set_exception(result)
+
     @staticmethod
     def setDefaultAmqpc(amqpc):
         Proxy.__amqpc = amqpc
@@ -93,7 +278,7 @@ class Proxy():
     def __getattr__(self, attr):
         # order is important !
         if attr != Proxy.__pull_commands_task and hasattr(self, Proxy.__pull_commands_task):
-            return partial(self.call_command, attr)
+            return partial(CommandHandle, self, attr)
         return super(Proxy, self).__getattribute__(attr)
 
 
@@ -110,18 +295,28 @@ class Proxy():
                 delattr(self ,Proxy.__pull_commands_task)
         
 
+    async def _wait_actor(self, delay):
+        """Sleep delay seconds or until the client sees a reply from the actor."""
+
+        callbacks = getattr(self.amqpc, "sender_callbacks", None)
+        if callbacks is None or not delay:
+            return await asyncio.sleep(delay)
+
+        seen = asyncio.Event()
+        callbacks.setdefault(self.actor, set()).add(seen.set)
+        try:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(seen.wait(), delay)
+        finally:
+            callbacks[self.actor].discard(seen.set)
+
     async def _pull_commands(self, delay = 0, attempts = 1):
         for c in range(attempts):
             try:
-                await asyncio.sleep(delay)
-
-                reply = await self.call_command(Proxy.__commands)
-
-                commands = reply[Proxy.__commands_key] if isinstance(reply, dict) else reply.help
+                # exponential backoff with jitter
+                await self._wait_actor(min(Proxy.pull_commands_delay_max, delay * 2 ** c) * random.uniform(0.5, 1.0))
 
-                for c in commands:
-                    setattr(self, c, partial(self.call_command, c))
-                    # setattr(self, f"nowait_{c}", partial(self.call_command, c, nowait=True))
+                await self._query_commands()
 
                 await self.__delattr_pull_commands_task()
                 return
@@ -136,9 +331,148 @@ class Proxy():
                     return    
 
         self.amqpc.log.debug(f"actor {self.actor} connect attempts stopped.")
+        self._set_ready(ProxyActorIsNotReachableException(self.actor))
         await self.__delattr_pull_commands_task()
 
 
+    async def _query_commands(self):
+        """Query and set actor commands once, raises if the actor is not reachable."""
+
+        def reply_version(reply):
+            return reply.get("version") if isinstance(reply, Mapping) else None
+
+        reply = signatures = None
+        if self.actor in Proxy.unsigned_actors:
+            reply = await self.call_command(Proxy.__commands)
+            if reply_version(reply) != Proxy.unsigned_actors[self.actor]:
+                reply = None
+
+        if reply is None:
+            try:
+                reply = await self.call_command(Proxy.__commands, "--signatures")
+                signatures = [json.loads(s) for s in reply[Proxy.__commands_key]]
+                Proxy.unsigned_actors.pop(self.actor, None)
+
+            except Exception as ex:
+                # actor without command signatures
+                self.amqpc.log.debug(f"actor {self.actor} no command signatures {ex}")
+                reply = await self.call_command(Proxy.__commands)
+                Proxy.unsigned_actors[self.actor] = reply_version(reply)
+
+        if signatures is not None:
+            commands = [s["name"] for s in signatures]
+        else:
+            commands = reply[Proxy.__commands_key] if isinstance(reply, Mapping) else reply.help
+
+        version = reply_version(reply)
+        self._set_commands(commands, signatures)
+
+        schema = None
+        if self.typed:
+            schema = await self._load_schema((version, _catalogue_hash(commands, signatures)))
+        self._save_commands_cache(commands, version, signatures, schema)
+
+    async def _load_schema(self, revision = None):
+        """Fetch the actor schema once per actor revision, eg: version and catalogue, returns it if fetched."""
+
+        if (self.actor, revision) in Proxy.schema_decoders:
+            self._decoder = Proxy.schema_decoders[(self.actor, revision)]
+            return None
+        try:
+            reply = await self.call_command(Proxy.__get_schema)
+            schema = json.loads(reply["schema"])
+            self._set_schema(schema, revision)
+
+        except Exception as ex:
+            self.amqpc.log.debug(f"actor {self.actor} no schema {ex}")
+            return None
+        return schema
+
+    def _set_schema(self, schema, revision = None):
+        """Compile the reply decoder from the actor schema, once per actor revision."""
+
+        key = (self.actor, revision)
+        if key not in Proxy.schema_decoders:
+            decoder = compile_decoder(schema)
+            # decoders of older revisions are stale.
+            for k in [k for k in Proxy.schema_decoders if k[0] == self.actor]:
+                del Proxy.schema_decoders[k]
+            Proxy.schema_decoders[key] = decoder
+        self._decoder = Proxy.schema_decoders[key]
+
+
+    def _set_commands(self, commands, signatures = None):
+        for c in self._commands:
+            if c not in commands and c in self.__dict__:
+                delattr(self, c)
+
+        for c in commands:
+            setattr(self, c, partial(CommandHandle, self, c))
+            # setattr(self, f"nowait_{c}", partial(self.call_command, c, nowait=True))
+
+        self._commands = list(commands)
+        self._encoders = {s["name"]: compile_encoder(s) for s in signatures} if signatures else {}
+        self._set_ready(True)
+
+    def _commands_cache_path(self):
+        return os.path.join(os.path.expanduser(Proxy.commands_cache), f"{self.actor}.json")
+
+    def _load_commands_cache(self):
+        """Set actor commands from the on-disk cache, returns False if there is no entry."""
+
+        if not Proxy.commands_cache:
+            return False
+        try:
+            with open(self._commands_cache_path()) as f:
+                entry = json.load(f)
+            self._set_commands(entry["commands"], entry.get("signatures"))
+            if entry.get("signatures") is None:
+                Proxy.unsigned_actors.setdefault(self.actor, entry["version"])
+            if self.typed and entry.get("schema") is not None:
+                self._set_schema(entry["schema"], (entry["version"], entry["hash"]))
+            self.amqpc.log.debug(f"actor {self.actor} {entry['version']} commands from cache.")
+            return True
+
+        except Exception as ex:
+            self.amqpc.log.debug(f"actor {self.actor} no commands cache {ex}")
+            return False
+
+    def _save_commands_cache(self, commands, version, signatures = None, schema = None):
+        """Write the catalogue, and the schema of typed proxies, to the on-disk cache if anything changed."""
+
+        if not Proxy.commands_cache:
+            return
+        catalogue_hash = _catalogue_hash(commands, signatures)
+        entry = {"actor": self.actor, "version": version, "hash": catalogue_hash,
+                 "commands": list(commands), "signatures": signatures, "schema": schema}
+        path = self._commands_cache_path()
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            if cached["version"] == version and cached["hash"] == catalogue_hash \
+               and (schema is None or cached.get("schema") == schema):
+                return
+        except Exception:
+            pass
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{uuid.uuid4().hex[:8]}"
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+
+        except OSError as ex:
+            self.amqpc.log.warning(f"actor {self.actor} commands cache not writable {ex}")
+
+    async def _actor_is_local(self):
+        if self._actor_host is None:
+            try:
+                self._actor_host = (await self.call_command(Proxy.__host))["text"]
+            except Exception as ex:
+                self.amqpc.log.debug(f"actor {self.actor} host unknown {ex}")
+                self._actor_host = ""
+        return self._actor_host == gethostname()
+
     def isAmqpcConnected(self):
         if not self.amqpc.connection.connection:
             return False
@@ -153,17 +487,71 @@ class Proxy():
         if hasattr(reply, "status") and reply.status.did_fail:
             raise self._errorMapToException(reply.replies[-1].message['error'])
 
-        msg = ProxyDict(reply.replies[-1].message)
+        # the message is already decoded by clu, like in _handle_callback.
+        msg = reply.replies[-1].message
+        if self._decoder:
+            msg = self._decode(msg)
+        elif not isinstance(msg, self.reply_type):
+            msg = self.reply_type(msg)
         msg.sender = reply.actor
 
         return msg
 
+    def _decode(self, message):
+        if issubclass(self.reply_type, MutableMapping):
+            return self._decoder(message, self.reply_type)
+        return self.reply_type(self._decoder(message))
+
     def _handle_callback(self, callback: Optional[Callable[[AMQPReply], None]], reply: AMQPReply):
-        msg = ProxyDict(json.loads(reply.message.body))
+        # the body is already decoded by clu.
+        msg = self._decode(reply.body) if self._decoder else self.reply_type(reply.body)
         msg.command_status = CommandStatus.code_to_status(reply.message_code)
         msg.sender = reply.sender
         callback(msg)
 
+    def batch(self, concurrent:bool = False, return_exceptions:bool = False, time_limit:float = 42.0):
+        """Returns a ProxyBatch, the commands called on it are sent as one __batch command.
+
+        >>> async with proxy.batch() as batch:
+        ...     batch.setX(1)
+        ...     batch.setY(2)
+        >>> batch.results
+        """
+
+        return ProxyBatch(self, concurrent, return_exceptions, time_limit)
+
+    async def _call_batch(self, commands, concurrent, time_limit):
+        args = ["--concurrent", *commands] if concurrent else commands
+        return await self.call_command(Proxy.__batch, *args, time_limit=time_limit)
+
+    def _encode_arguments(self, command, args, kwargs, local = False):
+        """Returns the encoded arguments and the shared memory handles passed."""
+
+        handles = []
+
+        def encode(v):
+            if isinstance(v, (int, float, bool)): return v
+            elif shm.is_shm_handle(v):
+                if not local: return f"'{shm.shm_get(v)}'"
+                handles.append(v)
+                return v
+            elif isinstance(v, str): return v if v[0] in "'\"" and v[-1] in "'\"" else quote(v)
+            v = compression.maybe_compress(jsonbackend.dumps(v))
+            if local and self.use_shm and len(v) >= shm.shm_threshold:
+                v = shm.shm_put(v)
+                handles.append(v)
+            return f"'{v}'"
+
+        encoder = self._encoders.get(command)
+        if encoder:
+            args = encoder(args, kwargs, encode)
+        else:
+            args = [encode(v) for v in args] \
+                 + list(chain.from_iterable(('--' + k, encode(v))
+                                            for k, v in kwargs.items()))
+
+        return args, handles
+
     async def call_command(self,
                            command: str,
                            *args,
@@ -174,35 +562,65 @@ class Proxy():
                            object_hook: Optional[Callable[[AMQPReply], None]] = None,
                            **kwargs):
 
-        def encode(v):
-            if isinstance(v, (int, float, bool)): return v
-            elif isinstance(v, str): return v if v[0] in "'\"" and v[-1] in "'\"" else quote(v)
-            return f"'{json.dumps(v)}'"
-
-        args = [encode(v) for v in args] \
-             + list(chain.from_iterable(('--' + k, encode(v))
-                                        for k, v in kwargs.items()))
-
-        fu = await self.amqpc.send_command(self.actor,
-                                           command,
-                                           *args,
-                                           callback=partial(self._handle_callback, callback) if callback else None,
-                                           time_limit=time_limit)
-        
-
+        local = False
+        if (self.use_shm and (args or kwargs)) or any(map(shm.is_shm_handle, chain(args, kwargs.values()))):
+            local = await self._actor_is_local()
+
+        args, handles = self._encode_arguments(command, args, kwargs, local)
+
+        if handles and time_limit:
+            # the actor removes the payloads, we clean up the ones never received, without a time limit we cant know.
+            self.amqpc.loop.call_later(time_limit, lambda: [shm.shm_release(h) for h in handles])
+
+        if callback or nowait or nosync or not (command in self.coalesce or command in self.reply_cache.ttls):
+            fu = await self.amqpc.send_command(self.actor,
+                                               command,
+                                               *args,
+                                               callback=partial(self._handle_callback, callback) if callback else None,
+                                               time_limit=time_limit)
+
+            if nosync: return
+            if nowait: return self._handle_command_reply(fu)
+
+            return await self._handle_command_reply(fu)
+
+        key = (command, *args)
+        cached = command in self.reply_cache.ttls
+        if cached:
+            reply = self.reply_cache.get(key)
+            if reply is not None:
+                return reply
+
+        if command in self.coalesce:
+            # single flight, the first caller's time_limit applies to all.
+            shared = self._inflight.get(key)
+            if shared is None:
+                shared = self._inflight[key] = asyncio.ensure_future(self._send_command(command, args, time_limit))
+                shared.add_done_callback(lambda _: self._inflight.pop(key, None))
+            reply = deepcopy(await asyncio.shield(shared))
+        else:
+            reply = await self._send_command(command, args, time_limit)
 
-        if nosync: return
-        if nowait: return self._handle_command_reply(fu)
+        if cached:
+            self.reply_cache.put(key, reply)
+        return reply
 
+    async def _send_command(self, command, args, time_limit):
+        fu = await self.amqpc.send_command(self.actor, command, *args, time_limit=time_limit)
         return await self._handle_command_reply(fu)
 
 
     @staticmethod
     def _errorMapToException(em):
-        if isinstance(em, dict):
+        if isinstance(em, dict) and 'exception_message' in em:
             return Proxy._stringToException(em['exception_message'],
                                             em['exception_type'],
                                             em['exception_module'])
+        if isinstance(em, dict) and 'message' in em:
+            # exceptions expanded by clu
+            return Proxy._stringToException(em['message'],
+                                            em.get('type', 'Exception'),
+                                            em.get('module', 'builtins'))
         return Exception(em)
 
     @staticmethod
@@ -224,27 +642,599 @@ class Proxy():
             return Exception(f'Unknown module type {mn}-{tn}:{sval}')
 
 
-async def invoke(*cmds, return_exceptions:Bool=False):
-    """invokes one or many commands in parallel
+class ReplyCache():
+    """Reply cache with a time to live per command and LRU eviction.
 
-    On error it throws an exception if one of the commands fails as a dict
-    with an exception and return values for every command.
+    Entries are keyed by command and encoded arguments, hits, misses and evictions are counted.
+    """
+
+    def __init__(self, ttls:dict, maxsize:int = 256):
+        """ init """
+
+        self.ttls = dict(ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key:tuple):
+        """Returns a copy of the fresh reply of key or None."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return deepcopy(entry[1])
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key:tuple, reply:ProxyDict):
+        """Stores a copy of reply if its command is cached."""
+
+        ttl = self.ttls.get(key[0])
+        if not ttl:
+            return
+        self._entries[key] = (monotonic() + ttl, deepcopy(reply))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, command:str = None):
+        """Removes all entries or the ones of command."""
+
+        if command is None:
+            self._entries.clear()
+        else:
+            for key in [k for k in self._entries if k[0] == command]:
+                del self._entries[key]
+
+    def stats(self):
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class CommandHandle():
+    """Awaitable actor command, returned by the proxy command attributes.
+
+    Carries actor, command and the monotonic send time, it is a coroutine
+    so it can be awaited, passed to asyncio.create_task or to invoke.
+    The command is created when first awaited, until then its time_limit can be adjusted.
+    Only commands running in their own task, from start() or asyncio.create_task, can be cancelled.
+
+    >>> cmd = proxy.status()
+    >>> cmd.actor, cmd.command
+    ('proto', 'status')
+    >>> await cmd
     """
 
-    def isProxy(p):
-        return 'self' in p.cr_frame.f_locals and isinstance(p.cr_frame.f_locals['self'], Proxy)
+    __slots__ = ("actor", "command", "sent", "_proxy", "_args", "_kwargs", "_coro", "_task", "_runner")
+
+    def __init__(self, proxy:Proxy, command:str, *args, **kwargs):
+        """ init """
+
+        self.actor = proxy.actor
+        self.command = command
+        self.sent = None
+        self._proxy = proxy
+        self._args = args
+        self._kwargs = kwargs
+        self._coro = None
+        self._task = None
+        self._runner = None
+
+    def __repr__(self):
+        return f"<CommandHandle {self.actor}.{self.command} sent={self.sent}>"
+
+    @property
+    def time_limit(self):
+        return self._kwargs.get("time_limit")
+
+    def limit_time(self, seconds:float):
+        """Lowers the time_limit of a command not sent yet to at most seconds."""
+
+        if self._coro is None:
+            # clu ignores a time_limit of 0
+            seconds = max(seconds, 1e-3)
+            self._kwargs["time_limit"] = min(self.time_limit or seconds, seconds)
+
+    def _coroutine(self, runner = None):
+        if self._coro is None:
+            self.sent = monotonic()
+            self._runner = runner
+            self._coro = self._proxy.call_command(self.command, *self._args, **self._kwargs)
+        elif self._coro is False:
+            raise asyncio.CancelledError()
+        return self._coro
+
+    def start(self):
+        """Sends the command in its own task, returns self."""
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self)
+        return self
+
+    def cancel(self):
+        """Cancels the task running the command, a command never started is discarded.
+
+        Returns False if the command is done or awaited directly, cancelling would cancel the awaiting task.
+        """
+
+        if self._task is not None:
+            return self._task.cancel()
+        if self._coro is None:
+            self._coro = False
+            return True
+        if not self._coro or self._runner is None or getcoroutinestate(self._coro) == CORO_CLOSED:
+            return False
+        return self._runner.cancel()
+
+    def __await__(self):
+        if self._task is not None:
+            return (yield from self._task.__await__())
+        return (yield from self._coroutine().__await__())
+
+    # send and throw are only used if the handle is the coroutine of a task, it is the runner.
+    def send(self, value):
+        return self._coroutine(asyncio.current_task()).send(value)
+
+    def throw(self, *args):
+        return self._coroutine(asyncio.current_task()).throw(*args)
+
+    def close(self):
+        if self._coro:
+            self._coro.close()
+
+
+class ProxyBatch():
+    """Collects commands and sends them to the actor as one __batch command when the block ends.
+
+    Every call returns a future of its reply, all replies are in results.
+    Failed commands raise ProxyPartialInvokeException like invoke does, unless return_exceptions is set.
+    Commands with the name of a ProxyBatch attribute can be added with add(command, *args, **kwargs).
+    """
+
+    def __init__(self, proxy:Proxy, concurrent:bool = False, return_exceptions:bool = False, time_limit:float = 42.0):
+        """ init """
+
+        self.proxy = proxy
+        self.concurrent = concurrent
+        self.return_exceptions = return_exceptions
+        self.time_limit = time_limit
+        self.results = None
+        self._commands = []
+        self._futures = []
+
+    def __getattr__(self, command):
+        if command.startswith("_"):
+            raise AttributeError(command)
+        return partial(self.add, command)
+
+    def add(self, command:str, *args, **kwargs):
+        """Adds a command, returns the future of its reply."""
+
+        args, _ = self.proxy._encode_arguments(command, args, kwargs)
+        self._commands.append(" ".join(map(str, [command, *args])))
+        self._futures.append(asyncio.get_event_loop().create_future())
+        return self._futures[-1]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            for fu in self._futures:
+                fu.cancel()
+            return False
+        await self.send()
+
+    async def send(self):
+        """Sends the collected commands, returns their replies."""
+
+        commands, futures = self._commands, self._futures
+        self._commands, self._futures = [], []
+
+        try:
+            reply = await self.proxy._call_batch(commands, self.concurrent, self.time_limit) if commands else {"help": []}
+        except BaseException as ex:
+            # the batch itself failed, eg: actor without __batch or time limit.
+            for fu in futures:
+                if isinstance(ex, asyncio.CancelledError):
+                    fu.cancel()
+                else:
+                    fu.set_exception(ex)
+                    fu.exception()
+            raise
+
+        self.results = ProxyListOfDicts()
+        items = reply["help"]
+        for i, fu in enumerate(futures):
+            if i < len(items):
+                item = jsonbackend.loads(items[i])
+                msg = ProxyDict(item["reply"])
+                msg.sender = self.proxy.actor
+                ex = Proxy._errorMapToException(msg.get("error")) if CommandStatus[item["status"]].did_fail else None
+            else:
+                ex = ProxyException(f"no reply for {commands[i]} from {self.proxy.actor} batch")
+            if ex is not None:
+                fu.set_exception(ex)
+                # reported by results, no warning if the future is ignored.
+                fu.exception()
+                msg = ProxyDict({"error": ex})
+            else:
+                fu.set_result(msg)
+            self.results.append(msg)
+        self.results.actors = [self.proxy.actor] * len(self.results)
 
-    actors=[c.cr_frame.f_locals['self'].actor if isProxy(c) else 'local' for c in cmds]
+        if not self.return_exceptions and any("error" in r for r in self.results):
+            raise ProxyPartialInvokeException(*self.results)
 
-    ret = await asyncio.gather(*cmds, return_exceptions=True)
+        return self.results
 
-    def _format(r):
-        if isinstance(r, dict): return ProxyDict(r)
-        elif isinstance(r, Exception): return ProxyDict({'error': r}) 
-        else: return r
 
-    ret = ProxyListOfDicts([_format(r) for r in ret])
+class ProxyStream():
+    """Async iterator over the intermediate replies of a command, ends with the final reply.
+
+    Intermediate replies are buffered up to maxsize, if the consumer falls behind the oldest
+    replies are dropped and counted in dropped, so reply processing is never blocked.
+
+    >>> async for msg in proxy.stream.expose(10):
+    ...     print(msg.command_status, msg)
+    """
+
+    def __init__(self, proxy:Proxy, command:str, *args, maxsize:int = 64, **kwargs):
+        """ init """
+
+        self.proxy = proxy
+        self.command = command
+        self.dropped = 0
+        self._args = args
+        self._kwargs = kwargs
+        self._replies = deque(maxlen=maxsize)
+        self._event = asyncio.Event()
+        self._task = None
+        self._finished = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._task:
+            self._task = asyncio.ensure_future(self.proxy.call_command(self.command, *self._args, callback=self._put, **self._kwargs))
+            self._task.add_done_callback(lambda t: self._event.set())
+
+        while True:
+            if self._replies:
+                return self._replies.popleft()
+            if self._task.done():
+                if self._finished:
+                    raise StopAsyncIteration
+                self._finished = True
+                msg = self._task.result()
+                msg.command_status = CommandStatus.DONE
+                return msg
+            self._event.clear()
+            await self._event.wait()
+
+    async def aclose(self):
+        """Cancel the command if still running."""
+
+        self._finished = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    def _put(self, msg):
+        if msg.command_status.is_done:
+            return
+        if len(self._replies) == self._replies.maxlen:
+            self.dropped += 1
+        self._replies.append(msg)
+        self._event.set()
+
+
+class ProxyStreams():
+    """Returns ProxyStream objects for actor commands, eg: proxy.stream.expose(10)"""
+
+    __slots__ = ("_proxy",)
+
+    def __init__(self, proxy:Proxy):
+        self._proxy = proxy
+
+    def __getattr__(self, command):
+        return partial(ProxyStream, self._proxy, command)
+
+
+class SyncProxy():
+    """Blocking proxy for non async code, safe to call from many threads.
+
+    All SyncProxy objects share one event loop running in a background thread
+    and one Client connection, the actor commands are blocking methods.
+
+    >>> proxy = SyncProxy("proto").start()
+    >>> proxy.ping()
+    {'text': 'Pong.'}
+    """
+
+    _loop = None
+    _thread = None
+    _lock = threading.Lock()
+    _amqpc = None
+    _amqpc_started = None
+
+    def __init__(self, actor:str, amqpc:BaseClient = None, timeout:float = None, **kwargs):
+        """ init
+
+        Without amqpc the shared Client is connected, kwargs are passed to it the first time.
+        timeout limits the time a call blocks, the command itself is limited by its time_limit.
+        """
+
+        self.timeout = timeout
+        if not amqpc:
+            amqpc = self._run(SyncProxy._client(kwargs))
+        self._proxy = Proxy(actor, amqpc=amqpc)
+
+    @classmethod
+    def _background_loop(cls):
+        with cls._lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                cls._thread = threading.Thread(target=cls._loop.run_forever, name="cluplus-sync-proxy", daemon=True)
+                cls._thread.start()
+        return cls._loop
+
+    @classmethod
+    async def _client(cls, kwargs):
+        # runs in the background loop, no lock needed.
+        if cls._amqpc is None:
+            cls._amqpc = Client(**kwargs)
+        if cls._amqpc_started is None or (cls._amqpc_started.done() and cls._amqpc_started.exception()):
+            cls._amqpc_started = asyncio.ensure_future(cls._amqpc.start())
+        await asyncio.shield(cls._amqpc_started)
+        return cls._amqpc
+
+    def _run(self, coro, timeout:float = None):
+        if threading.current_thread() is SyncProxy._thread:
+            coro.close()
+            raise RuntimeError("SyncProxy can not be called from its own event loop, use Proxy.")
+        fu = asyncio.run_coroutine_threadsafe(coro, self._background_loop())
+        try:
+            return fu.result(timeout)
+        except concurrent.futures.TimeoutError:
+            fu.cancel()
+            raise
+
+    @property
+    def actor(self):
+        return self._proxy.actor
+
+    def start(self):
+        """Query and set actor commands."""
+
+        self._run(self._proxy.start())
+        return self
+
+    def stop(self):
+        self._run(self._proxy.stop())
+
+    def call_command(self, command:str, *args, **kwargs):
+        """Calls an actor command and blocks until its final reply."""
+
+        return self._run(self._proxy.call_command(command, *args, **kwargs), self.timeout)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr not in self._proxy._commands:
+            raise AttributeError(f"{attr} is not a command of {self._proxy.actor}")
+        return partial(self.call_command, attr)
+
+    def __dir__(self):
+        return [*super().__dir__(), *self._proxy._commands]
+
+
+class ProxyPool(dict):
+    """Many proxies started together.
+
+    All catalogues are pulled concurrently with at most max_concurrency requests in flight,
+    unreachable actors share one retry cycle. ready holds a future per actor.
+    Actors with a cached catalogue, see Proxy.commands_cache, are ready at once and revalidated in the retry cycle.
+    """
+
+    def __init__(self, actors, amqpc:BaseClient = None, max_concurrency:int = 16, **kwargs):
+        """ init """
+
+        super().__init__((a, Proxy(a, amqpc=amqpc, **kwargs)) for a in actors)
+        self.max_concurrency = max_concurrency
+        self.ready = {}
+        self._pull_commands_task = None
+
+    async def start(self, ready_fraction:float = 1.0):
+        """Start pulling all catalogues, returns once ready_fraction of the actors are ready."""
+
+        proxies = list(self.values())
+        if proxies and not proxies[0].isAmqpcConnected():
+            await proxies[0].amqpc.start()
+
+        loop = asyncio.get_running_loop()
+        self.ready = {a: loop.create_future() for a in self}
+        for a, p in self.items():
+            if p._load_commands_cache():
+                self.ready[a].set_result(p)
+        self._pull_commands_task = loop.create_task(self._pull_commands())
+
+        needed = ceil(ready_fraction * len(self))
+        waiting = set(self.ready.values())
+        while waiting and len(self.actors_ready()) < needed:
+            _, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+        return self
+
+    async def stop(self):
+        """Stop pulling and stop all proxies."""
+
+        if self._pull_commands_task:
+            self._pull_commands_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._pull_commands_task
+            self._pull_commands_task = None
+        for f in self.ready.values():
+            f.cancel()
+        await asyncio.gather(*[p.stop() for p in self.values()])
+
+    def actors_ready(self):
+        """Actors with their commands pulled."""
+
+        return [a for a, f in self.ready.items() if f.done() and not f.cancelled() and f.exception() is None]
+
+    async def _pull_commands(self):
+        sem = asyncio.Semaphore(self.max_concurrency)
+        queried = set()
+
+        async def query(actor):
+            async with sem:
+                try:
+                    await self[actor]._query_commands()
+                    queried.add(actor)
+                    if not self.ready[actor].done():
+                        self.ready[actor].set_result(self[actor])
+                except Exception as ex:
+                    self[actor].amqpc.log.debug(f"actor {actor} currently not reachable {ex}")
+
+        # cached catalogues are revalidated too, they stay ready if the actor is not reachable.
+        pending = list(self)
+        for c in range(Proxy.pull_commands_attempts):
+            await asyncio.gather(*[query(a) for a in pending])
+            pending = [a for a in pending if a not in queried]
+            if not pending:
+                return
+            await asyncio.sleep(min(Proxy.pull_commands_delay_max, Proxy.pull_commands_delay * 2 ** c) * random.uniform(0.5, 1.0))
+
+        for a in pending:
+            if not self.ready[a].done():
+                self.ready[a].set_exception(ProxyActorIsNotReachableException(a))
+                self[a]._set_ready(ProxyActorIsNotReachableException(a))
+
+
+async def start_many(*actors, amqpc:BaseClient = None, max_concurrency:int = 16, ready_fraction:float = 1.0, **kwargs):
+    """creates and starts a ProxyPool for actors"""
+
+    return await ProxyPool(actors, amqpc=amqpc, max_concurrency=max_concurrency, **kwargs).start(ready_fraction)
+
+
+class InvokeScheduler():
+    """Runs commands in a bounded window, optionally limited per actor.
+
+    Measures the time every command waited for a slot and the time it ran,
+    with a deadline the time_limit of every command is lowered to the remaining time.
+    """
+
+    def __init__(self, max_concurrency:int = None, per_actor_limit:int = None, deadline:float = None):
+        """ init
+
+        deadline is an absolute time of time.monotonic.
+        """
+
+        self.window = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.per_actor = defaultdict(partial(asyncio.Semaphore, per_actor_limit)) if per_actor_limit else None
+        self.deadline = deadline
+
+    async def run(self, actor:str, cmd):
+        """Awaits cmd within the limits, returns the result or exception, queue and execution time."""
+
+        t0 = monotonic()
+        if self.per_actor is not None: await self.per_actor[actor].acquire()
+        try:
+            if self.window: await self.window.acquire()
+            try:
+                t1 = monotonic()
+                if self.deadline is not None and isinstance(cmd, CommandHandle):
+                    cmd.limit_time(self.deadline - t1)
+                try:
+                    ret = await cmd
+                except Exception as ex:
+                    ret = ex
+                return ret, t1 - t0, monotonic() - t1
+
+            finally:
+                if self.window: self.window.release()
+        finally:
+            if self.per_actor is not None: self.per_actor[actor].release()
+
+
+def _invoke_actors(cmds):
+    def actor(c):
+        if isinstance(c, CommandHandle):
+            return c.actor
+        # plain call_command coroutines
+        p = getattr(c, 'cr_frame', None) and c.cr_frame.f_locals.get('self')
+        return p.actor if isinstance(p, Proxy) else 'local'
+
+    return [actor(c) for c in cmds]
+
+
+def _invoke_format(r):
+    if isinstance(r, dict): return ProxyDict(r)
+    elif isinstance(r, BaseException): return ProxyDict({'error': r})
+    else: return r
+
+
+async def invoke(*cmds, return_exceptions:Bool=False, max_concurrency:int=None, per_actor_limit:int=None,
+                 deadline:float=None, fail_fast:Bool=False):
+    """invokes one or many commands in parallel
+
+    On error it throws an exception if one of the commands fails as a dict
+    with an exception and return values for every command.
+
+    With max_concurrency at most that many commands are in flight, with per_actor_limit
+    at most that many per actor. The time every command waited and ran is stored
+    in queue_times and exec_times of the returned list.
+
+    With deadline all commands have to finish within that many seconds, the remaining time
+    is passed as time_limit to every command sent. With fail_fast the first failing command
+    cancels all others. Cancelled commands are returned as {'error': TimeoutError or CancelledError}.
+    """
+
+    actors = _invoke_actors(cmds)
+    end = monotonic() + deadline if deadline is not None else None
+
+    scheduler = InvokeScheduler(max_concurrency, per_actor_limit, end)
+    tasks = [asyncio.ensure_future(scheduler.run(a, c)) for a, c in zip(actors, cmds)]
+
+    pending = set(tasks)
+    cancelled = asyncio.CancelledError()
+    try:
+        while pending:
+            timeout = end - monotonic() if end is not None else None
+            if timeout is not None and timeout <= 0:
+                cancelled = asyncio.TimeoutError(f"invoke deadline of {deadline}s exceeded")
+                break
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED if fail_fast else asyncio.ALL_COMPLETED)
+            if fail_fast and any(not t.cancelled() and isinstance(t.result()[0], Exception) for t in done):
+                cancelled = asyncio.CancelledError("cancelled after first failure")
+                break
+    finally:
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    ret = [(cancelled, None, None) if t.cancelled() else t.result() for t in tasks]
+
+    queue_times = [q for _, q, _ in ret]
+    exec_times = [e for _, _, e in ret]
+
+    ret = ProxyListOfDicts([_invoke_format(r) for r, _, _ in ret])
     ret.actors = actors
+    ret.queue_times = queue_times
+    ret.exec_times = exec_times
 
     if not return_exceptions:
         for r in ret:
@@ -254,6 +1244,35 @@ async def invoke(*cmds, return_exceptions:Bool=False):
     return ret
 
 
+async def invoke_as_completed(*cmds, max_concurrency:int=None, per_actor_limit:int=None):
+    """yields (actor, reply) pairs in the order the commands finish
+
+    Failed commands are yielded as {'error': exception} like invoke does,
+    commands still running are cancelled when the generator is closed early with aclose().
+
+    >>> async for actor, reply in invoke.as_completed(*[p.status() for p in proxies]):
+    ...     print(actor, reply)
+    """
+
+    scheduler = InvokeScheduler(max_concurrency, per_actor_limit)
+
+    async def run(actor, cmd):
+        return actor, await scheduler.run(actor, cmd)
+
+    tasks = [asyncio.ensure_future(run(a, c)) for a, c in zip(_invoke_actors(cmds), cmds)]
+    try:
+        for fu in asyncio.as_completed(tasks):
+            actor, (r, _, _) = await fu
+            yield actor, _invoke_format(r)
+
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+invoke.as_completed = invoke_as_completed
+
+
 def unpack(data, *keys, as_seq:bool=False, exception_on_missing_keys:bool=False):
     """ unpacks every parameter from the message of the finish reply or list of replies.
 
@@ -296,41 +1315,224 @@ def unpack(data, *keys, as_seq:bool=False, exception_on_missing_keys:bool=False)
 
     if isinstance(data, list):
         if len(keys) > 0:
-            rkeys = [k for r in data for k in list(r.keys())]
-            if exception_on_missing_keys:
-                bkeys = [k for k in keys if not fnmatch.filter(rkeys, k)]
-                if bkeys:
-                    raise ProxyUnpackKeysNotAllFoundException(bkeys)
-
-            return unpacking([d[fn] for k in keys for d in data for fn in fnmatch.filter(d, k)],  as_seq)
+            values, missing = _unpack_keys(data, keys)
+            if exception_on_missing_keys and missing:
+                raise ProxyUnpackKeysNotAllFoundException(missing)
+            return unpacking(values, as_seq)
         else:
-            return unpacking([val for d in data for val in list(d.values())], as_seq)
+            return unpacking([val for d in data for val in d.values()], as_seq)
 
     if len(data) == 1:
         return unpacking(list(data.values()), as_seq)
     elif len(keys) > 0:
-        return unpacking([data[fn] for k in keys for fn in fnmatch.filter(data, k)], as_seq)
+        return unpacking(_unpack_keys((data,), keys)[0], as_seq)
     return list(data.values())
 
 
+@lru_cache(maxsize=1024)
+def _key_pattern(key:str):
+    # None for plain keys, they are looked up directly.
+    if not any(c in key for c in "*?["):
+        return None
+    return re.compile(fnmatch.translate(key)).match
+
+
+def _unpack_keys(data, keys):
+    """returns the values of keys in every dict of data, in key order, and the keys without any match."""
+
+    values = []
+    missing = []
+    for k in keys:
+        n = len(values)
+        match = _key_pattern(k)
+        if match is None:
+            values.extend(d[k] for d in data if k in d)
+        else:
+            # replies mostly share their keys, match every key name once.
+            matched = {}
+            for d in data:
+                for fn, v in d.items():
+                    m = matched.get(fn)
+                    if m is None:
+                        m = matched[fn] = match(fn) is not None
+                    if m:
+                        values.append(v)
+        if len(values) == n:
+            missing.append(k)
+    return values, missing
+
+
+# marks missing values in columns, None is a valid reply value.
+_missing = object()
+
+
+def _flat_items(d: Mapping, parent_key: str = '', sep: str = '.'):
+    # depth first without recursion, a stack of item iterators.
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            key = prefix + sep + k if prefix else k
+            if isinstance(v, Mapping):
+                stack.append((key, iter(v.items())))
+                break
+            yield key, v
+        else:
+            stack.pop()
+
+
 def flatten(d: MutableMapping, parent_key: str = '', sep: str = '.'):
     """ flattens a dict of dicts structure """
-    def _flatten_dict_gen(d, parent_key, sep):
-        for k, v in d.items():
-            new_key = parent_key + sep + k if parent_key else k
-            if isinstance(v, MutableMapping):
-                yield from flatten(v, new_key, sep=sep).items()
+
+    return ProxyDict(_flat_items(d, parent_key, sep))
+
+
+def unflatten(d: Mapping, sep: str = '.'):
+    """ nests a flattened dict again, the inverse of flatten
+
+        A key that is also the prefix of other keys raises ValueError, whatever the key order.
+    """
+
+    nested = ProxyDict()
+    # only nodes made here are extended, never values of d.
+    created = set()
+    for key, v in d.items():
+        *path, last = key.split(sep)
+        node = nested
+        for p in path:
+            if p not in node:
+                child = node[p] = ProxyDict()
+                created.add(id(child))
+            else:
+                child = node[p]
+                if id(child) not in created:
+                    raise ValueError(f"key {key} conflicts with a value at {p}")
+            node = child
+        if last in node:
+            raise ValueError(f"key {key} conflicts with nested keys")
+        node[last] = v
+    return nested
+
+
+class ProxyFlatView(Mapping):
+   """ Flattened read only view of a dict of dicts, dotted keys are resolved on access """
+
+   __slots__ = ("_data", "_sep")
+
+   def __init__(self, data: Mapping, sep: str = '.'):
+        self._data = data
+        self._sep = sep
+
+   def __getitem__(self, key):
+        d = self._data
+        while True:
+            if key in d and not isinstance(d[key], Mapping):
+                return d[key]
+            # keys may contain the separator themselves, try the shortest head first.
+            i = key.find(self._sep)
+            while i >= 0:
+                head = key[:i]
+                if head in d and isinstance(d[head], Mapping):
+                    d, key = d[head], key[i + len(self._sep):]
+                    break
+                i = key.find(self._sep, i + 1)
             else:
-                yield new_key, v
+                raise KeyError(key)
+
+   def __iter__(self):
+        return (k for k, _ in _flat_items(self._data, '', self._sep))
+
+   def __len__(self):
+        return sum(1 for _ in _flat_items(self._data, '', self._sep))
 
-    return ProxyDict(_flatten_dict_gen(d, parent_key, sep))
+   def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
 
 
 class ProxyDict(dict):
    """ Extra helper class for the reply dict """
 
-   def flatten(self):
-        return flatten(self)
+   # no __dict__ is allocated as long as only sender and command_status are set.
+   __slots__ = ("sender", "command_status", "__dict__")
+
+   def flatten(self, sep: str = '.'):
+        return flatten(self, sep=sep)
+
+   def flat_view(self, sep: str = '.'):
+        return ProxyFlatView(self, sep)
+
+   def unpack(self, *keys, as_seq:bool=False, exception_on_missing_keys:bool=False):
+        return unpack(self, *keys, as_seq=as_seq, exception_on_missing_keys=exception_on_missing_keys)
+
+
+Proxy.reply_type = ProxyDict
+
+
+# key tables shared by all compact replies with the same keys, bounded by max_key_tables.
+_key_tables = {}
+max_key_tables = 4096
+
+
+def _key_table(keys:tuple):
+    table = _key_tables.get(keys)
+    if table is None:
+        keys = tuple(map(sys.intern, keys))
+        table = (keys, {k: i for i, k in enumerate(keys)})
+        if len(_key_tables) < max_key_tables:
+            _key_tables[keys] = table
+    return table
+
+
+class CompactProxyDict(Mapping):
+   """ Compact read only reply dict.
+
+       The values are stored in a tuple, the interned keys in a table shared by all replies
+       with the same keys, nested dicts are compact too. unpack, flatten and flat_view work like for ProxyDict.
+   """
+
+   __slots__ = ("_table", "_values", "sender", "command_status")
+
+   def __init__(self, data = ()):
+        if isinstance(data, Mapping):
+            keys, values = tuple(data), data.values()
+        else:
+            data = tuple(data)
+            keys, values = tuple(k for k, _ in data), (v for _, v in data)
+        self._table = _key_table(keys)
+        self._values = tuple(CompactProxyDict(v) if isinstance(v, dict) else v for v in values)
+
+   def __getitem__(self, key):
+        return self._values[self._table[1][key]]
+
+   def __contains__(self, key):
+        return key in self._table[1]
+
+   def __iter__(self):
+        return iter(self._table[0])
+
+   def __len__(self):
+        return len(self._values)
+
+   def __repr__(self):
+        return repr(dict(zip(self._table[0], self._values)))
+
+   def __reduce__(self):
+        return (CompactProxyDict, (tuple(zip(self._table[0], self._values)),),
+                {s: getattr(self, s) for s in ("sender", "command_status") if hasattr(self, s)})
+
+   def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+
+   def to_dict(self):
+        """ returns a mutable ProxyDict """
+        return ProxyDict((k, v.to_dict() if isinstance(v, CompactProxyDict) else v) for k, v in self.items())
+
+   def flatten(self, sep: str = '.'):
+        return flatten(self, sep=sep)
+
+   def flat_view(self, sep: str = '.'):
+        return ProxyFlatView(self, sep)
 
    def unpack(self, *keys, as_seq:bool=False, exception_on_missing_keys:bool=False):
         return unpack(self, *keys, as_seq=as_seq, exception_on_missing_keys=exception_on_missing_keys)
@@ -338,12 +1540,92 @@ class ProxyDict(dict):
 
 class ProxyListOfDicts(list):
    """ Extra helper class for the reply list of dicts """
-   def flatten(self):
-        return ProxyListOfDicts([flatten(d) for d in self])
+   def flatten(self, sep: str = '.'):
+        flat = ProxyListOfDicts(map(partial(flatten, sep=sep), self))
+        if hasattr(self, "actors"):
+            flat.actors = self.actors
+        return flat
 
    def unpack(self, *keys, as_seq:bool=False, exception_on_missing_keys:bool=False):
         return unpack(self, *keys, as_seq=as_seq, exception_on_missing_keys=exception_on_missing_keys)
 
+   def _columns(self, keys, flat, sep, actor_key):
+        n = len(self)
+        columns = {}
+        for i, d in enumerate(self):
+            for k, v in (_flat_items(d, '', sep) if flat else d.items()):
+                col = columns.get(k)
+                if col is None:
+                    col = columns[k] = [_missing] * n
+                col[i] = v
+        if keys:
+            selected = {}
+            for k in keys:
+                match = _key_pattern(k)
+                for c in ([k] if k in columns else []) if match is None else [c for c in columns if match(c)]:
+                    selected[c] = columns[c]
+            columns = selected
+        if actor_key and getattr(self, "actors", None):
+            if actor_key in columns:
+                raise ValueError(f"reply key {actor_key!r} collides with the actor column, choose another actor_key")
+            columns = {actor_key: list(self.actors), **columns}
+        return columns
+
+   def to_columns(self, *keys, flat:bool=True, sep:str='.', actor_key:str='actor'):
+        """ returns a dict of columns by flattened reply key, with the actor names as column actor_key.
+
+            Missing values are None, keys can be glob patterns like for unpack.
+            A reply key equal to actor_key raises ValueError, use another actor_key or None for no actor column.
+        """
+        return {k: [None if v is _missing else v for v in col] for k, col in self._columns(keys, flat, sep, actor_key).items()}
+
+   def to_numpy(self, *keys, flat:bool=True, sep:str='.', actor_key:str='actor'):
+        """ returns a dict of numpy arrays by flattened reply key, like to_columns.
+
+            The dtype is inferred once per column, columns with missing values are masked arrays.
+            Lists of the same length become 2d columns, everything else, eg: mixed types, falls back to dtype object.
+        """
+        import numpy as np
+
+        def kind(v):
+            if isinstance(v, (bool, np.bool_)): return bool
+            if isinstance(v, (int, float, np.number)): return float
+            return type(v)
+
+        def column(col):
+            mask = np.fromiter((v is _missing for v in col), dtype=bool, count=len(col))
+            present = [v for v in col if v is not _missing] if mask.any() else col
+            try:
+                values = np.asarray(present)
+                if values.dtype == object and values.ndim > 1:
+                    raise ValueError()
+                # numpy would turn mixed types silently into strings or numbers.
+                if values.dtype != object and len({kind(v) for v in np.asarray(present, dtype=object).flat}) > 1:
+                    raise ValueError()
+            except ValueError:
+                values = np.empty(len(present), dtype=object)
+                for i, v in enumerate(present):
+                    values[i] = v
+            if not mask.any():
+                return values
+            arr = np.ma.masked_all((len(col), *values.shape[1:]), dtype=values.dtype)
+            arr[~mask] = values
+            return arr
+
+        return {k: column(col) for k, col in self._columns(keys, flat, sep, actor_key).items()}
+
+   def to_records(self, *keys, flat:bool=True, sep:str='.', actor_key:str='actor'):
+        """ returns a structured numpy array with a field per flattened reply key, masked if values are missing. """
+        import numpy as np
+
+        columns = self.to_numpy(*keys, flat=flat, sep=sep, actor_key=actor_key)
+        dtype = [(k, c.dtype, c.shape[1:]) for k, c in columns.items()]
+        masked = any(isinstance(c, np.ma.MaskedArray) for c in columns.values())
+        records = np.ma.masked_all(len(self), dtype=dtype) if masked else np.empty(len(self), dtype=dtype)
+        for k, c in columns.items():
+            records[k] = c
+        return records
+
    def with_actors(self):
         return dict(zip(self.actors, self))
 
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: schemas.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+reply decoders compiled from the actor json schema published by get_schema.
+
+Numeric arrays become numpy arrays, date-time, date and time strings become datetime objects,
+objects are decoded recursively. Keys without a decodable schema are passed through untouched,
+the replies are not validated again, the actor already does it before sending.
+'''
+
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import Callable, Optional
+
+
+def _parse_datetime(v):
+    # fromisoformat only knows the Z suffix from python 3.11 on.
+    return datetime.fromisoformat(v[:-1] + "+00:00" if v.endswith("Z") else v)
+
+
+_string_formats = {"date-time": _parse_datetime,
+                   "date": date.fromisoformat,
+                   "time": time.fromisoformat}
+
+
+def _resolve(schema: dict, root: dict) -> dict:
+    while "$ref" in schema:
+        ref = schema["$ref"]
+        if not ref.startswith("#"):
+            return {}
+        schema = root
+        for part in filter(None, ref[1:].split("/")):
+            schema = schema[part.replace("~1", "/").replace("~0", "~")]
+    return schema
+
+
+def _numeric_dtype(schema: dict, root: dict) -> Optional[str]:
+    # dtype of a, possibly nested, array of numbers or None.
+    schema = _resolve(schema, root)
+    types = schema.get("type")
+    if types == "array" and isinstance(schema.get("items"), dict):
+        return _numeric_dtype(schema["items"], root)
+    return {"number": "float64", "integer": "int64"}.get(types)
+
+
+def _array(asarray: Callable, dtype) -> Callable:
+    def convert(v):
+        if not isinstance(v, list):
+            raise TypeError(f"expected array, got {v!r}")
+        return asarray(v, dtype=dtype)
+    return convert
+
+
+def _converter(schema: dict, root: dict, resolving: frozenset) -> Optional[Callable]:
+    ref = schema.get("$ref")
+    if ref in resolving:
+        return None
+    schema = _resolve(schema, root)
+    resolving = resolving | {ref} if ref else resolving
+
+    types = schema.get("type")
+    if isinstance(types, list):
+        types = [t for t in types if t != "null"]
+        if len(types) != 1:
+            return None
+        types = types[0]
+
+    convert = None
+    if types == "string":
+        convert = _string_formats.get(schema.get("format"))
+
+    elif types == "object":
+        convert = _compile_object(schema, root, resolving)
+
+    elif types == "array" and isinstance(schema.get("items"), dict):
+        dtype = _numeric_dtype(schema["items"], root)
+        if dtype:
+            try:
+                import numpy as np
+                convert = _array(np.asarray, getattr(np, dtype))
+            except ImportError:
+                pass
+        else:
+            item = _converter(schema["items"], root, resolving)
+            if item:
+                convert = lambda v: [item(i) for i in v]
+
+    return convert
+
+
+def _compile_object(schema: dict, root: dict, resolving: frozenset) -> Optional[Callable]:
+    converters = {}
+    for key, prop in schema.get("properties", {}).items():
+        convert = _converter(prop, root, resolving)
+        if convert:
+            converters[key] = convert
+
+    if not converters:
+        return None
+
+    # only the keys with a converter are visited, the other keys are copied by the factory.
+    items = tuple(converters.items())
+
+    def decode(message, factory=dict):
+        decoded = factory(message)
+        for k, c in items:
+            v = decoded.get(k)
+            if v is not None:
+                try:
+                    decoded[k] = c(v)
+                except (TypeError, ValueError, AttributeError, OverflowError):
+                    # values the schema does not describe are passed through.
+                    pass
+        return decoded
+
+    return decode
+
+
+def compile_decoder(schema: dict) -> Optional[Callable]:
+    '''
+    compiles an actor schema into a decoder(message, factory=dict) returning a copy of the message,
+    made with the mutable mapping factory, with typed values.
+
+    Returns None if nothing in the schema needs decoding.
+    '''
+    return _compile_object(schema, schema, frozenset())
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: shm.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+same host payload handoff via shared memory files.
+
+The sender writes the payload to a file in /dev/shm and sends a small json handle instead,
+the receiver reads the payload and removes the file. Payloads never received are removed by
+the sender with shm_release().
+'''
+
+from __future__ import annotations
+
+import os
+import re
+import json
+import uuid
+import tempfile
+
+from contextlib import suppress
+from socket import gethostname
+
+from .exceptions import ProxySharedMemoryException
+
+
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SHM_MARKER = "cluplus/shm"
+SHM_NAME = re.compile(r"cluplus-[0-9a-f]{32}")
+
+# payloads smaller than this are always sent inline.
+shm_threshold = 1 << 20
+
+
+def is_shm_handle(value) -> bool:
+    '''
+    checks if value is a shared memory handle, quoted or not.
+    '''
+    return isinstance(value, str) and value.lstrip("'").startswith('{"' + SHM_MARKER)
+
+
+def shm_put(payload: str) -> str:
+    '''
+    writes payload to shared memory and returns the handle.
+    '''
+    path = os.path.join(SHM_DIR, f"cluplus-{uuid.uuid4().hex}")
+    # only readable by the user, the payload is a command argument.
+    with os.fdopen(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600), "w") as f:
+        f.write(payload)
+    return json.dumps({SHM_MARKER: {"host": gethostname(), "path": path}})
+
+
+def _shm_path(spec: dict) -> str:
+    # the handle arrives over the network, only files written by shm_put are accepted.
+    try:
+        path = os.path.realpath(spec["path"])
+    except (KeyError, TypeError, ValueError):
+        raise ProxySharedMemoryException("invalid shared memory handle")
+    if os.path.dirname(path) != os.path.realpath(SHM_DIR) or not SHM_NAME.fullmatch(os.path.basename(path)):
+        raise ProxySharedMemoryException(f"shared memory path {spec['path']!r} not allowed")
+    return path
+
+
+def _shm_spec(handle: str) -> dict:
+    try:
+        spec = json.loads(handle.strip("'"))[SHM_MARKER]
+    except (ValueError, KeyError, TypeError):
+        raise ProxySharedMemoryException("invalid shared memory handle")
+    if not isinstance(spec, dict):
+        raise ProxySharedMemoryException("invalid shared memory handle")
+    return spec
+
+
+def shm_get(handle: str) -> str:
+    '''
+    reads the payload of the handle and removes the shared memory file.
+
+    Raises ProxySharedMemoryException for handles of other hosts or paths not written by shm_put.
+    '''
+    spec = _shm_spec(handle)
+    if spec.get("host") != gethostname():
+        raise ProxySharedMemoryException(f"shared memory handle from host {spec.get('host')} not reachable")
+    path = _shm_path(spec)
+    try:
+        with os.fdopen(os.open(path, os.O_RDONLY | os.O_NOFOLLOW), "r") as f:
+            payload = f.read()
+    except FileNotFoundError:
+        raise ProxySharedMemoryException(f"shared memory payload {path} not found")
+    except OSError:
+        raise ProxySharedMemoryException(f"shared memory payload {path} not readable")
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as ex:
+        raise ProxySharedMemoryException(f"shared memory payload {path} not removable: {ex.strerror}")
+    return payload
+
+
+def shm_release(handle: str):
+    '''
+    removes the shared memory file of the handle, if still there.
+    '''
+    with suppress(FileNotFoundError):
+        os.unlink(_shm_path(_shm_spec(handle)))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: signatures.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+command signatures published by __commands --signatures and the argument encoders compiled from them.
+'''
+
+from __future__ import annotations
+
+from typing import Callable
+
+from .exceptions import ProxyCommandArgumentsException
+
+
+def command_signature(name: str, command) -> dict:
+    '''
+    returns the signature of a click command as json compatible dict.
+    '''
+    def default(p):
+        if p.required or not isinstance(p.default, (bool, int, float, str, list, tuple, dict)):
+            return None
+        return p.default
+
+    params = []
+    for p in command.params:
+        param = {"name": p.name,
+                 "kind": p.param_type_name,
+                 "type": p.type.name,
+                 "required": p.required,
+                 "nargs": p.nargs,
+                 "default": default(p)}
+        if p.param_type_name == "option":
+            param.update({"opts": p.opts, "secondary_opts": p.secondary_opts, "is_flag": p.is_flag, "multiple": p.multiple,
+                          "count": getattr(p, "count", False)})
+        if hasattr(p.type, "choices"):
+            param["choices"] = [str(c) for c in p.type.choices]
+            param["case_sensitive"] = getattr(p.type, "case_sensitive", True)
+        params.append(param)
+
+    return {"name": name, "params": params}
+
+
+def _encode_integer(v, fallback):
+    if isinstance(v, bool) or not isinstance(v, (int, str)):
+        raise TypeError(f"expected integer, got {v!r}")
+    return v if isinstance(v, int) else fallback(v)
+
+
+def _encode_float(v, fallback):
+    if isinstance(v, bool) or not isinstance(v, (int, float, str)):
+        raise TypeError(f"expected float, got {v!r}")
+    return v if not isinstance(v, str) else fallback(v)
+
+
+def _encode_boolean(v, fallback):
+    if not isinstance(v, (bool, int, str)):
+        raise TypeError(f"expected boolean, got {v!r}")
+    return v if not isinstance(v, str) else fallback(v)
+
+
+def _encoder_for(param: dict) -> Callable:
+    encoder = {"integer": _encode_integer,
+               "float": _encode_float,
+               "boolean": _encode_boolean}.get(param["type"])
+
+    if "choices" in param:
+        case_sensitive = param.get("case_sensitive", True)
+        fold = (lambda v: v) if case_sensitive else str.casefold
+        choices = {fold(c) for c in param["choices"]}
+        def _encode_choice(v, fallback):
+            if fold(str(v)) not in choices:
+                raise TypeError(f"{v!r} is not one of {sorted(param['choices'])}")
+            return fallback(v)
+        return _encode_choice
+
+    return encoder or (lambda v, fallback: fallback(v))
+
+
+def compile_encoder(signature: dict) -> Callable:
+    '''
+    compiles a command signature into an encoder(args, kwargs, fallback) returning the encoded argument list.
+
+    Types without a specialized encoder are encoded with fallback,
+    invalid calls raise ProxyCommandArgumentsException.
+
+    Returns None for signatures that can't be matched locally, eg: a variadic argument
+    followed by other arguments, such commands are sent unvalidated.
+    '''
+    command = signature["name"]
+    arguments = [p for p in signature["params"] if p["kind"] == "argument"]
+    variadic = next((p for p in arguments if p["nargs"] == -1), None)
+    if variadic and variadic is not arguments[-1]:
+        return None
+    positional = [(p["name"], p["required"], p["nargs"], _encoder_for(p)) for p in arguments if p["nargs"] != -1]
+    variadic_encoder = _encoder_for(variadic) if variadic else None
+    required = sum(n for _, r, n, _ in positional if r)
+    slots = sum(n for _, _, n, _ in positional)
+
+    options = {}
+    for p in signature["params"]:
+        if p["kind"] != "option":
+            continue
+        secondary = p.get("secondary_opts") or []
+        opt = max(p["opts"], key=len)
+        # a count option is a flag given n times.
+        nargs = 0 if p.get("count") else p["nargs"]
+        entry = (opt, max(secondary, key=len) if secondary else None, p["is_flag"], p["multiple"], nargs, _encoder_for(p))
+        options[p["name"]] = entry
+        for o in p["opts"]:
+            options[o.lstrip("-")] = entry
+        for o in secondary:
+            # no_track=True is --no-track
+            options[o.lstrip("-").replace("-", "_")] = (o, None, True, False, 1, None)
+
+    def values(name, v, nargs, e, fallback):
+        # nargs > 1 values are given as one list or tuple.
+        if nargs == 1:
+            return [e(v, fallback)]
+        if not isinstance(v, (list, tuple)) or len(v) != nargs:
+            raise TypeError(f"{name} expects {nargs} values, got {v!r}")
+        return [e(i, fallback) for i in v]
+
+    def encoder(args, kwargs, fallback):
+        try:
+            encoded = []
+            i = 0
+            for name, is_required, nargs, e in positional:
+                if i >= len(args):
+                    if is_required:
+                        raise TypeError(f"missing argument {name}")
+                    break
+                if nargs == 1 or (isinstance(args[i], (list, tuple)) and len(args[i]) == nargs):
+                    encoded += values(name, args[i], nargs, e, fallback)
+                    i += 1
+                else:
+                    # nargs values given one by one
+                    encoded += values(name, tuple(args[i:i + nargs]), nargs, e, fallback)
+                    i += nargs
+            if i < len(args):
+                if not variadic:
+                    raise TypeError(f"takes {required}{f' to {slots}' if slots != required else ''} argument values, got {len(args)}")
+                encoded += [variadic_encoder(v, fallback) for v in args[i:]]
+
+            for k, v in kwargs.items():
+                if k not in options:
+                    raise TypeError(f"unknown option {k!r}")
+                opt, secondary, is_flag, multiple, nargs, e = options[k]
+                if is_flag:
+                    if v: encoded.append(opt)
+                    elif secondary: encoded.append(secondary)
+                elif nargs == 0:
+                    if not isinstance(v, int) or v < 0:
+                        raise TypeError(f"{k} expects a count, got {v!r}")
+                    encoded += [opt] * v
+                elif multiple and isinstance(v, (list, tuple)) and (nargs == 1 or all(isinstance(i, (list, tuple)) for i in v)):
+                    for i in v:
+                        encoded += [opt, *values(k, i, nargs, e, fallback)]
+                else:
+                    encoded += [opt, *values(k, v, nargs, e, fallback)]
+            return encoded
+
+        except TypeError as ex:
+            raise ProxyCommandArgumentsException(f"{command}(): {ex}")
+
+    return encoder
@@ -16,6 +16,10 @@ import uuid
 import pytest
 import pytest_asyncio
 
+from types import SimpleNamespace
+
+from clu import AMQPClient, CommandStatus
+
 from proto.actor.actor import ProtoActor
 
 @pytest.fixture(scope="session")
@@ -33,3 +37,22 @@ async def proto_test_actor(event_loop):
 
     await actor.stop()
 
+
+@pytest.fixture
+def counting_amqpc():
+    """An unconnected client replying {"status": {"temp": [20.0]}} to every command, sent commands are recorded."""
+
+    amqpc = AMQPClient(name=f"counting-{uuid.uuid4().hex[:8]}")
+    amqpc.sent = []
+
+    async def send_command(actor, command, *args, callback=None, time_limit=None):
+        amqpc.sent.append((command, *args))
+        await asyncio.sleep(0.05)
+        fu = asyncio.get_running_loop().create_future()
+        fu.set_result(SimpleNamespace(actor=actor,
+                                      status=CommandStatus.DONE,
+                                      replies=[SimpleNamespace(message={"status": {"temp": [20.0]}})]))
+        return fu
+
+    amqpc.send_command = send_command
+    return amqpc
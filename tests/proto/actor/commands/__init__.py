@@ -4,9 +4,11 @@ import os
 
 import click
 from clu.parsers.click import command_parser
-from cluplus.parsers.click import __commands
+from cluplus.parsers.click import __commands, __host, __batch
 
 command_parser.add_command(__commands)
+command_parser.add_command(__host)
+command_parser.add_command(__batch)
 #command_parser.add_command(foo)
 
 from . import complex_data_with_jsonpickle
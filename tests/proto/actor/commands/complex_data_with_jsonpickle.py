@@ -7,32 +7,15 @@
 # @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
 
 '''
-import os
-import sys
-import logging
-import time
-import uuid
-
 import numpy as np
-import jsonpickle
-import asyncio
-from proto.actor.exceptions import ProtoActorAPIError
-
-from clu import AMQPClient, CommandStatus
 
-loop=asyncio.new_event_loop()
+from cluplus.proxy import SyncProxy
+from cluplus.parsers.jsonpickle import pickle
 
-amqpc = AMQPClient(name=f"{sys.argv[0]}.proxy-{uuid.uuid4().hex[:8]}")
-loop.run_until_complete(amqpc.start())
+proxy = SyncProxy("proto").start()
 
 def bigData(data):
-    async def _call(data):
-        proxy = amqpc.proxy('proto')
-        fut = await proxy.send_command("bigData", "'" + data + "'")
-        return await fut
-    pickled_data = jsonpickle.encode(data, make_refs=False)
-    return loop.run_until_complete(_call(pickled_data))
-    
+    return proxy.bigData(pickle(data))
 
 
 bright = np.rec.array([(1,'Sirius', -1.45, 'A1V'),
@@ -38,3 +38,10 @@ def errPassAsError(command: Command):
     
 
 
+
+
+@command_parser.command(name='errUnserializable')
+def errUnserializable(command: Command):
+    """Finish with a reply that is not json serializable."""
+
+    command.finish(value=object())
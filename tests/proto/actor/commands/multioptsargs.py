@@ -42,3 +42,38 @@ async def gotoRaDecJ2000(command: Command, ra_h: float, deg_d: float):
              ra_h=ra_h,
              deg_d=deg_d
            )
+
+@command_parser.command("moveTo")
+@click.argument("POSITION", type=float, nargs=2)
+@click.option("--offset", type=float, nargs=2, default=(0.0, 0.0))
+@click.option("--track/--no-track", default=True)
+async def moveTo(command: Command, position: tuple, offset: tuple, track: bool):
+    """mount move to position"""
+
+    return command.finish(
+             position=list(position),
+             offset=list(offset),
+             track=track
+           )
+
+@command_parser.command("setFilter")
+@click.argument("FILTER", type=click.Choice(["Red", "Green", "Blue"], case_sensitive=False))
+@click.option("-v", "--verbose", count=True)
+async def setFilter(command: Command, filter: str, verbose: int):
+    """camera set filter"""
+
+    return command.finish(
+             filter=filter,
+             verbose=verbose
+           )
+
+@command_parser.command("copyTo")
+@click.argument("SOURCES", nargs=-1)
+@click.argument("TARGET")
+async def copyTo(command: Command, sources: tuple, target: str):
+    """camera copy images to target"""
+
+    return command.finish(
+             sources=list(sources),
+             target=target
+           )
@@ -13,7 +13,7 @@ import uuid
 from clu import AMQPClient, CommandStatus
 
 from cluplus import __version__
-from cluplus.proxy import Proxy, unpack, flatten, ProxyDict, ProxyListOfDicts
+from cluplus.proxy import Proxy, unpack, flatten, unflatten, ProxyDict, CompactProxyDict, ProxyListOfDicts
 from cluplus.exceptions import ProxyUnpackKeysNotAllFoundException
 
 from proto.actor.actor import ProtoActor
@@ -162,6 +162,19 @@ def test_proxy_wildcard_unpack():
     a = unpack(data, '*.filename')
     assert(a == ["/bla", "/foo", "/bar"])
 
+def test_proxy_mixed_keys_unpack():
+
+    data = [{"east.key1": 1, "east.key2": 2, "west.key1": 3}, {"east.key1": 4, "west.key[1]": 5}]
+
+    assert(unpack(data, "west.key?", "east.key1") == [3, 1, 4])
+    assert(unpack(data, "west.key[[]1]", "*.key2") == [5, 2])
+    assert(unpack(data, "east.key1", "north.*", as_seq=True) == [1, 4])
+
+    with pytest.raises(ProxyUnpackKeysNotAllFoundException) as ex:
+        unpack(data, "north.*", "east.key1", "south", exception_on_missing_keys=True)
+    assert(ex.value.args[0] == ["north.*", "south"])
+
+
 def test_proxy_flatten():
     data = {'a': 1, 'b': 2, 'e': {'c': 3, 'd': 4, 'e': 8}}
     assert(flatten(data) == {'a': 1, 'b': 2, 'e.c': 3, 'e.d': 4, 'e.e': 8})
@@ -171,3 +184,213 @@ def test_proxy_flatten():
 
     data = ProxyListOfDicts([data, data])
     assert(data.flatten()[1] == {'a': 1, 'b': 2, 'e.c': 3, 'e.d': 4, 'e.e': 8})
+
+    data.actors = ["a", "b"]
+    assert(data.flatten().with_actors()["b"]["e.c"] == 3)
+
+
+def test_proxy_flatten_deep():
+
+    data = leaf = {}
+    for i in range(2000):
+        leaf["v"] = i
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    leaf["v"] = "bottom"
+
+    flat = flatten(data)
+    assert(len(flat) == 2001)
+    assert(list(flat)[:2] == ["v", "n.v"])
+    assert(flat[".".join(["n"] * 2000) + ".v"] == "bottom")
+    assert(flatten(unflatten(flat)) == flat)
+
+
+def test_proxy_flat_view():
+
+    data = ProxyDict({'a': 1, 'e': {'c': 3, 'f': {'g': 5}}, 'east.filename': '/bla', 'x': {'y.z': 6}})
+    view = data.flat_view()
+
+    assert(view['e.f.g'] == 5)
+    assert(view['east.filename'] == '/bla')
+    assert(view['x.y.z'] == 6)
+    assert('e.f' not in view and 'e.q' not in view)
+    assert(dict(view) == flatten(data))
+    assert(len(view) == 5)
+
+    data['e']['c'] = 4
+    assert(view['e.c'] == 4)
+
+
+def test_proxy_unflatten():
+
+    data = {'a': 1, 'e': {'c': 3, 'f': {'g': 5}}}
+    assert(unflatten(flatten(data)) == data)
+    assert(unflatten({'a/b': 1, 'a/c': 2}, sep='/') == {'a': {'b': 1, 'c': 2}})
+
+    for conflict in ({'a': 1, 'a.b': 2}, {'a': None, 'a.b': 1}, {'a.b': 1, 'a': 2}, {'a.b': 1, 'a': None},
+                     {'a': {'x': 1}, 'a.b': 2}):
+        with pytest.raises(ValueError):
+            unflatten(conflict)
+
+
+def test_proxy_commands_cache(tmp_path):
+
+    commands_cache, Proxy.commands_cache = Proxy.commands_cache, str(tmp_path)
+    try:
+        amqpc = AMQPClient(name=f"proxy_cache-{uuid.uuid4().hex[:8]}")
+        proxy = Proxy("proto_cache", amqpc=amqpc)
+        assert(not proxy._load_commands_cache())
+
+        proxy._save_commands_cache(["ping", "setEnabled"], "0.5.2")
+        proxy = Proxy("proto_cache", amqpc=amqpc)
+        assert(proxy._load_commands_cache())
+        assert(callable(proxy.setEnabled))
+
+        proxy._save_commands_cache(["ping"], "0.5.2")
+        proxy._load_commands_cache()
+        assert(not hasattr(proxy, "setEnabled"))
+
+    finally:
+        Proxy.commands_cache = commands_cache
+
+
+@pytest.mark.asyncio
+async def test_proxy_compact_commands_without_signatures(tmp_path, monkeypatch):
+
+    import json
+    from types import SimpleNamespace
+
+    amqpc = AMQPClient(name=f"proxy_compact-{uuid.uuid4().hex[:8]}")
+    amqpc.sent = []
+    amqpc.version = "1.0"
+    monkeypatch.setattr(Proxy, "unsigned_actors", {})
+
+    async def send_command(actor, command, *args, callback=None, time_limit=None):
+        amqpc.sent.append((command, *args))
+        if args:
+            status, message = CommandStatus.FAILED, {"error": "no such option: --signatures"}
+        else:
+            status, message = CommandStatus.DONE, {"help": ["ping", "status"], "version": amqpc.version}
+        fu = asyncio.get_running_loop().create_future()
+        fu.set_result(SimpleNamespace(actor=actor, status=status, replies=[SimpleNamespace(message=message)]))
+        return fu
+
+    amqpc.send_command = send_command
+
+    commands_cache, Proxy.commands_cache = Proxy.commands_cache, str(tmp_path)
+    try:
+        proxy = Proxy("proto_compact", amqpc=amqpc, compact=True)
+        await proxy._query_commands()
+        assert(proxy._commands == ["ping", "status"])
+        await proxy.ready(timeout=1)
+
+        with open(proxy._commands_cache_path()) as f:
+            assert(json.load(f)["version"] == "1.0")
+        assert(amqpc.sent == [("__commands", "--signatures"), ("__commands",)])
+
+        # the failed signatures query is remembered, also from the on-disk cache.
+        amqpc.sent.clear()
+        Proxy.unsigned_actors.clear()
+        proxy = Proxy("proto_compact", amqpc=amqpc, compact=True)
+        assert(proxy._load_commands_cache())
+        await proxy._query_commands()
+        assert(amqpc.sent == [("__commands",)])
+
+        # a new version is asked for signatures again.
+        amqpc.sent.clear()
+        amqpc.version = "1.1"
+        await proxy._query_commands()
+        assert(amqpc.sent == [("__commands",), ("__commands", "--signatures"), ("__commands",)])
+        assert(Proxy.unsigned_actors["proto_compact"] == "1.1")
+
+    finally:
+        Proxy.commands_cache = commands_cache
+
+
+def test_proxy_handle_callback_decoded_body():
+
+    from types import SimpleNamespace
+
+    replies = []
+    reply = SimpleNamespace(message=SimpleNamespace(body=b"not parsed again"), body={'a': 1}, message_code=">", sender="proto")
+
+    Proxy._handle_callback(SimpleNamespace(reply_type=ProxyDict, _decoder=None), replies.append, reply)
+
+    assert(replies == [{'a': 1}])
+    assert(replies[0].command_status == CommandStatus.RUNNING)
+    assert(replies[0].sender == "proto")
+
+
+def test_proxy_list_of_dicts_columns():
+
+    import numpy as np
+
+    data = ProxyListOfDicts([ProxyDict({"temp": 1.5, "pos": [1, 2, 3], "state": {"mode": "a"}}),
+                             ProxyDict({"temp": 2.5, "pos": [4, 5, 6], "x": None}),
+                             ProxyDict({"pos": [7, 8, 9]})])
+    data.actors = ["a", "b", "c"]
+
+    columns = data.to_columns()
+    assert(list(columns) == ["actor", "temp", "pos", "state.mode", "x"])
+    assert(columns["temp"] == [1.5, 2.5, None])
+    assert(data.to_columns("state.*") == {"actor": ["a", "b", "c"], "state.mode": ["a", None, None]})
+
+    arrays = data.to_numpy()
+    assert(arrays["pos"].shape == (3, 3) and arrays["pos"].dtype == int)
+    assert(not isinstance(arrays["pos"], np.ma.MaskedArray))
+    assert(arrays["temp"].mask.tolist() == [False, False, True])
+    assert(arrays["temp"].mean() == 2.0)
+    assert(arrays["x"].mask.tolist() == [True, False, True])
+
+    records = data.to_records("temp", "pos")
+    assert(records.dtype.names == ("actor", "temp", "pos"))
+    assert(records["pos"][2].tolist() == [7, 8, 9])
+    assert(records["temp"].mask.tolist() == [False, False, True])
+
+    assert(ProxyListOfDicts([{"a": 1}, {"a": 2}]).to_records()["a"].tolist() == [1, 2])
+
+    mixed = ProxyListOfDicts([{"v": 1, "p": [1, 2], "f": 1, "b": True}, {"v": "x", "p": [3, "y"], "f": 2.5, "b": 1}])
+    arrays = mixed.to_numpy()
+    assert(arrays["v"].dtype == object and arrays["v"].tolist() == [1, "x"])
+    assert(arrays["p"].dtype == object and arrays["p"][1] == [3, "y"])
+    assert(arrays["f"].dtype == float)
+    assert(arrays["b"].dtype == object)
+
+    data = ProxyListOfDicts([{"actor": "x", "t": 1}, {"t": 2}])
+    data.actors = ["a", "b"]
+    with pytest.raises(ValueError):
+        data.to_columns()
+    assert(data.to_columns(actor_key="sender") == {"sender": ["a", "b"], "actor": ["x", None], "t": [1, 2]})
+    assert(data.to_columns(actor_key=None) == {"actor": ["x", None], "t": [1, 2]})
+
+
+def test_proxy_compact_dict():
+
+    import copy
+    import pickle
+
+    a = CompactProxyDict({"temp": 1.5, "state": {"mode": "a", "pos": [1, 2]}})
+    b = CompactProxyDict([("temp", 2.5), ("state", {"mode": "b", "pos": [3, 4]})])
+    a.sender = "proto"
+    a.command_status = CommandStatus.DONE
+
+    assert(a._table is b._table and a["state"]._table is b["state"]._table)
+    assert(a == {"temp": 1.5, "state": {"mode": "a", "pos": [1, 2]}})
+    assert(a.unpack("t*", "state") == [1.5, {"mode": "a", "pos": [1, 2]}])
+    assert(unpack(a.flatten(), "state.*") == ["a", [1, 2]])
+    assert(a.flatten() == {"temp": 1.5, "state.mode": "a", "state.pos": [1, 2]})
+    assert(a.flat_view()["state.pos"] == [1, 2])
+    assert(type(a.to_dict()) is type(a.to_dict()["state"]) is ProxyDict)
+
+    with pytest.raises(KeyError):
+        a["nope"]
+    with pytest.raises(AttributeError):
+        a.other = 1
+
+    for c in (copy.deepcopy(a), pickle.loads(pickle.dumps(a))):
+        assert(c == a and c.sender == "proto" and c.command_status == CommandStatus.DONE)
+
+    p = ProxyDict({"temp": 1.5})
+    p.other = 1
+    p.sender = "proto"
+    assert(p.other == 1 and p.sender == "proto")
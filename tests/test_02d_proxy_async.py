@@ -17,6 +17,7 @@ from clu import AMQPClient, CommandStatus
 
 from cluplus import __version__
 from cluplus.proxy import Proxy
+from cluplus.exceptions import ProxyActorIsNotReachableException
 
 from proto.actor.actor import ProtoActor
 
@@ -39,10 +40,7 @@ async def test_proxy_async_delayed(event_loop):
     assert(hasattr(proxy, "_pull_commands_task"))
     
     await actor_delayed.start()
-    for i in range(17):
-        if not hasattr(proxy, "_pull_commands_task"):
-            break
-        await asyncio.sleep(0.1)
+    await proxy.ready(timeout=1.7)
     assert(not hasattr(proxy, "_pull_commands_task"))
 
     await proxy.help()
@@ -59,7 +57,9 @@ async def test_proxy_async_delay_timeout(event_loop):
     actor_delayed = ProtoActor(name=f"proto_test_delayed-{uuid.uuid4().hex[:8]}")
 
     proxy = await Proxy(actor_delayed.name).start()
-    await asyncio.sleep(0.5)
+
+    with pytest.raises(ProxyActorIsNotReachableException):
+        await proxy.ready(timeout=0.5)
 
     assert(not hasattr(proxy, "_pull_commands_task"))
 
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02e_proxy_pool.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+import pytest_asyncio
+
+import asyncio
+import uuid
+
+from clu import AMQPClient
+
+from cluplus.proxy import Proxy, ProxyPool, start_many
+from cluplus.exceptions import ProxyActorIsNotReachableException
+
+
+@pytest.fixture
+def fake_actors(monkeypatch):
+
+    calls = {"inflight": 0, "max_inflight": 0}
+
+    async def _query_commands(self):
+        calls["inflight"] += 1
+        calls["max_inflight"] = max(calls["max_inflight"], calls["inflight"])
+        await asyncio.sleep(0.01)
+        calls["inflight"] -= 1
+        if self.actor.startswith("down"):
+            raise Exception("not reachable")
+        self._set_commands(["ping"])
+
+    monkeypatch.setattr(Proxy, "_query_commands", _query_commands)
+    monkeypatch.setattr(Proxy, "isAmqpcConnected", lambda self: True)
+    monkeypatch.setattr(Proxy, "pull_commands_delay", 0.01)
+    monkeypatch.setattr(Proxy, "pull_commands_attempts", 3)
+
+    yield calls
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_bounded(fake_actors):
+
+    amqpc = AMQPClient(name=f"proxy_pool-{uuid.uuid4().hex[:8]}")
+    actors = [f"up{i}" for i in range(20)] + ["down0", "down1"]
+
+    pool = await start_many(*actors, amqpc=amqpc, max_concurrency=4)
+
+    assert(fake_actors["max_inflight"] == 4)
+    assert(sorted(pool.actors_ready()) == sorted(actors[:20]))
+    assert(callable(pool["up0"].ping))
+
+    with pytest.raises(ProxyActorIsNotReachableException):
+        await pool.ready["down0"]
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_fraction(fake_actors):
+
+    amqpc = AMQPClient(name=f"proxy_pool-{uuid.uuid4().hex[:8]}")
+    actors = [f"up{i}" for i in range(8)] + ["down0", "down1"]
+
+    pool = await ProxyPool(actors, amqpc=amqpc, max_concurrency=2).start(ready_fraction=0.5)
+
+    assert(len(pool.actors_ready()) >= 5)
+    assert(not pool.ready["down0"].done())
+
+    await pool.ready["up7"]
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_commands_cache(fake_actors, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(Proxy, "commands_cache", str(tmp_path))
+    amqpc = AMQPClient(name=f"proxy_pool-{uuid.uuid4().hex[:8]}")
+    actors = ["up0", "down0", "down1"]
+
+    for a in actors[:2]:
+        Proxy(a, amqpc=amqpc)._save_commands_cache(["ping", "status"], "1.0")
+
+    pool = await ProxyPool(actors, amqpc=amqpc).start(ready_fraction=0.5)
+    assert(sorted(pool.actors_ready()) == ["down0", "up0"])
+    assert(callable(pool["down0"].status))
+    assert(fake_actors["max_inflight"] == 0)
+
+    await pool._pull_commands_task
+    # revalidated
+    assert(not hasattr(pool["up0"], "status"))
+    # not reachable but cached
+    assert(pool.ready["down0"].result() is pool["down0"])
+    with pytest.raises(ProxyActorIsNotReachableException):
+        await pool.ready["down1"]
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_actor(proto_test_actor, monkeypatch):
+
+    monkeypatch.setattr(Proxy, "pull_commands_delay", 0.1)
+    monkeypatch.setattr(Proxy, "pull_commands_attempts", 2)
+
+    pool = await start_many(proto_test_actor.name, f"proto_test_missing-{uuid.uuid4().hex[:8]}", ready_fraction=0.5)
+
+    assert(pool.actors_ready() == [proto_test_actor.name])
+    assert(await pool[proto_test_actor.name].ping() == {'text': 'Pong.'})
+
+    await pool.stop()
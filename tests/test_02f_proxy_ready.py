@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02f_proxy_ready.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+import uuid
+
+from clu import AMQPClient
+
+from cluplus.proxy import Proxy
+from cluplus.exceptions import ProxyActorIsNotReachableException
+
+
+def unconnected_client():
+
+    amqpc = AMQPClient(name=f"proxy_ready-{uuid.uuid4().hex[:8]}")
+    amqpc.loop = asyncio.get_running_loop()
+    return amqpc
+
+
+@pytest.fixture
+def flaky_actor(monkeypatch):
+
+    calls = {"count": 0, "fail": 3}
+
+    async def _query_commands(self):
+        calls["count"] += 1
+        if calls["count"] <= calls["fail"]:
+            raise Exception("not reachable")
+        self._set_commands(["ping"])
+
+    monkeypatch.setattr(Proxy, "_query_commands", _query_commands)
+    monkeypatch.setattr(Proxy, "isAmqpcConnected", lambda self: True)
+    monkeypatch.setattr(Proxy, "pull_commands_delay", 0.01)
+    monkeypatch.setattr(Proxy, "pull_commands_attempts", 5)
+
+    yield calls
+
+
+@pytest.mark.asyncio
+async def test_proxy_ready(flaky_actor):
+
+    proxy = await Proxy("proto_flaky", amqpc=unconnected_client()).start()
+    assert(hasattr(proxy, "_pull_commands_task"))
+
+    assert(await proxy.ready(timeout=1) is proxy)
+    assert(flaky_actor["count"] == 4)
+    assert(await proxy.ready() is proxy)
+    assert(callable(proxy.ping))
+
+
+@pytest.mark.asyncio
+async def test_proxy_ready_not_reachable(flaky_actor):
+
+    flaky_actor["fail"] = 100
+
+    proxy = await Proxy("proto_flaky", amqpc=unconnected_client()).start()
+
+    with pytest.raises(ProxyActorIsNotReachableException):
+        await proxy.ready(timeout=2)
+
+    with pytest.raises(ProxyActorIsNotReachableException):
+        await proxy.ready()
+
+
+@pytest.mark.asyncio
+async def test_proxy_ready_notified(flaky_actor, monkeypatch):
+
+    monkeypatch.setattr(Proxy, "pull_commands_delay", 10)
+    flaky_actor["fail"] = 1
+
+    amqpc = unconnected_client()
+    amqpc.sender_callbacks = {}
+
+    proxy = await Proxy("proto_flaky", amqpc=amqpc).start()
+    await asyncio.sleep(0.01)
+
+    for cb in amqpc.sender_callbacks["proto_flaky"]:
+        cb()
+
+    await proxy.ready(timeout=0.5)
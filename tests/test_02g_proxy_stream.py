@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02g_proxy_stream.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+import uuid
+
+from clu import AMQPClient, CommandStatus
+
+from cluplus.proxy import Proxy, ProxyDict
+
+
+def progress(n):
+
+    async def call_command(self, command, *args, callback=None, **kwargs):
+        for i in range(n):
+            msg = ProxyDict({"progress": i})
+            msg.command_status = CommandStatus.RUNNING
+            callback(msg)
+            await asyncio.sleep(0)
+        if args and args[0] == "fail":
+            raise ValueError("boom")
+        return ProxyDict({"done": n})
+
+    return call_command
+
+
+@pytest.mark.asyncio
+async def test_proxy_stream(monkeypatch):
+
+    monkeypatch.setattr(Proxy, "call_command", progress(5))
+    proxy = Proxy("proto_stream", amqpc=AMQPClient(name=f"proxy_stream-{uuid.uuid4().hex[:8]}"))
+
+    replies = [msg async for msg in proxy.stream.expose()]
+
+    assert(replies[:-1] == [{"progress": i} for i in range(5)])
+    assert(replies[-1] == {"done": 5})
+    assert(replies[-1].command_status == CommandStatus.DONE)
+
+
+@pytest.mark.asyncio
+async def test_proxy_stream_slow_consumer(monkeypatch):
+
+    monkeypatch.setattr(Proxy, "call_command", progress(10))
+    proxy = Proxy("proto_stream", amqpc=AMQPClient(name=f"proxy_stream-{uuid.uuid4().hex[:8]}"))
+
+    stream = proxy.stream.expose(maxsize=3)
+    replies = [await stream.__anext__()]
+    await asyncio.sleep(0.1)
+    replies += [msg async for msg in stream]
+
+    assert(stream.dropped == 6)
+    assert(replies[-4:-1] == [{"progress": i} for i in range(7, 10)])
+    assert(replies[-1] == {"done": 10})
+
+
+@pytest.mark.asyncio
+async def test_proxy_stream_exception(monkeypatch):
+
+    monkeypatch.setattr(Proxy, "call_command", progress(2))
+    proxy = Proxy("proto_stream", amqpc=AMQPClient(name=f"proxy_stream-{uuid.uuid4().hex[:8]}"))
+
+    replies = []
+    with pytest.raises(ValueError):
+        async for msg in proxy.stream.expose("fail"):
+            replies.append(msg)
+
+    assert(len(replies) == 2)
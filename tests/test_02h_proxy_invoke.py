@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02h_proxy_invoke.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+import uuid
+
+from clu import AMQPClient
+
+from cluplus.proxy import Proxy, ProxyDict, CommandHandle, invoke
+from cluplus.exceptions import ProxyPartialInvokeException
+
+
+@pytest.fixture
+def slow_actors(monkeypatch):
+
+    calls = {"inflight": {}, "max_inflight": 0, "max_per_actor": 0, "time_limits": []}
+
+    async def call_command(self, command, *args, **kwargs):
+        calls["time_limits"].append(kwargs.get("time_limit"))
+        inflight = calls["inflight"]
+        inflight[self.actor] = inflight.get(self.actor, 0) + 1
+        calls["max_inflight"] = max(calls["max_inflight"], sum(inflight.values()))
+        calls["max_per_actor"] = max(calls["max_per_actor"], inflight[self.actor])
+        try:
+            await asyncio.sleep(args[0] if args else 0.01)
+            if command == "fail":
+                raise ValueError(self.actor)
+            return ProxyDict({"actor": self.actor})
+        finally:
+            inflight[self.actor] -= 1
+
+    monkeypatch.setattr(Proxy, "call_command", call_command)
+
+    amqpc = AMQPClient(name=f"proxy_invoke-{uuid.uuid4().hex[:8]}")
+    yield calls, [Proxy(f"proto_{i}", amqpc=amqpc) for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_invoke_max_concurrency(slow_actors):
+
+    calls, proxies = slow_actors
+
+    ret = await invoke(*[p.call_command("status") for p in proxies for i in range(5)], max_concurrency=3)
+
+    assert(calls["max_inflight"] == 3)
+    assert(ret.actors == [p.actor for p in proxies for i in range(5)])
+    assert(ret == [{"actor": a} for a in ret.actors])
+    assert(max(ret.queue_times) > 0.05)
+    assert(all(0.005 < e < 0.05 for e in ret.exec_times))
+
+
+@pytest.mark.asyncio
+async def test_invoke_per_actor_limit(slow_actors):
+
+    calls, proxies = slow_actors
+
+    ret = await invoke(*[p.call_command("status") for p in proxies for i in range(5)], per_actor_limit=2)
+
+    assert(calls["max_per_actor"] == 2)
+    assert(calls["max_inflight"] == 8)
+    assert(len(ret) == 20)
+
+
+@pytest.mark.asyncio
+async def test_invoke_exceptions(slow_actors):
+
+    calls, proxies = slow_actors
+
+    with pytest.raises(ProxyPartialInvokeException):
+        await invoke(proxies[0].call_command("status"), proxies[1].call_command("fail"), max_concurrency=1)
+
+    ret = await invoke(proxies[0].call_command("status"), proxies[1].call_command("fail"),
+                       max_concurrency=1, return_exceptions=True)
+
+    assert(ret[0] == {"actor": "proto_0"})
+    assert(isinstance(ret[1]["error"], ValueError))
+    assert(ret.with_actors()["proto_1"] is ret[1])
+
+
+@pytest.mark.asyncio
+async def test_invoke_as_completed(slow_actors):
+
+    calls, proxies = slow_actors
+
+    ret = [(a, r) async for a, r in invoke.as_completed(proxies[0].call_command("status", 0.2),
+                                                         proxies[1].call_command("status", 0.01),
+                                                         proxies[2].call_command("fail", 0.05))]
+
+    assert([a for a, r in ret] == ["proto_1", "proto_2", "proto_0"])
+    assert(ret[0][1] == {"actor": "proto_1"})
+    assert(isinstance(ret[1][1]["error"], ValueError))
+
+
+@pytest.mark.asyncio
+async def test_invoke_as_completed_early_stop(slow_actors):
+
+    calls, proxies = slow_actors
+
+    replies = invoke.as_completed(proxies[0].call_command("status", 10),
+                                  proxies[1].call_command("status", 0.01))
+    async for a, r in replies:
+        break
+    await replies.aclose()
+
+    assert(a == "proto_1")
+    await asyncio.sleep(0)
+    assert(calls["inflight"]["proto_0"] == 0)
+
+
+@pytest.mark.asyncio
+async def test_command_handle(slow_actors):
+
+    calls, proxies = slow_actors
+    for p in proxies:
+        p._set_commands(["status", "fail"])
+
+    cmd = proxies[0].status(0.01)
+    assert(isinstance(cmd, CommandHandle))
+    assert((cmd.actor, cmd.command, cmd.sent) == ("proto_0", "status", None))
+    assert(await cmd == {"actor": "proto_0"})
+    assert(cmd.sent is not None)
+
+    assert(await asyncio.create_task(proxies[1].status(0.01)) == {"actor": "proto_1"})
+
+    ret = await invoke(proxies[2].status(), proxies[3].status(), return_exceptions=True)
+    assert(ret.actors == ["proto_2", "proto_3"])
+
+
+@pytest.mark.asyncio
+async def test_command_handle_cancel(slow_actors):
+
+    calls, proxies = slow_actors
+    proxies[0]._set_commands(["status"])
+
+    cmd = proxies[0].status(10).start()
+    await asyncio.sleep(0.01)
+    assert(calls["inflight"]["proto_0"] == 1)
+
+    cmd.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cmd
+    assert(calls["inflight"]["proto_0"] == 0)
+
+    proxies[0].status(10).cancel()
+
+
+@pytest.mark.asyncio
+async def test_command_handle_cancel_only_its_task(slow_actors):
+
+    calls, proxies = slow_actors
+    proxies[0]._set_commands(["status"])
+
+    cmd = proxies[0].status(0.01)
+    await cmd
+    assert(cmd.cancel() is False)
+    await asyncio.sleep(0.01)
+
+    async def caller(cmd):
+        return await cmd
+
+    cmd = proxies[0].status(0.05)
+    task = asyncio.create_task(caller(cmd))
+    await asyncio.sleep(0.01)
+    assert(cmd.cancel() is False)
+    assert(await task == {"actor": "proto_0"})
+
+    cmd = proxies[0].status(10)
+    task = asyncio.create_task(cmd)
+    await asyncio.sleep(0.01)
+    assert(cmd.cancel() is True)
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert(calls["inflight"]["proto_0"] == 0)
+    assert(cmd.cancel() is False)
+
+
+@pytest.mark.asyncio
+async def test_invoke_deadline(slow_actors):
+
+    calls, proxies = slow_actors
+    for p in proxies:
+        p._set_commands(["status", "fail"])
+
+    ret = await invoke(proxies[0].status(0.01), proxies[1].status(10), proxies[2].status(0.01, time_limit=0.1),
+                       deadline=0.2, return_exceptions=True)
+
+    assert(ret[0] == {"actor": "proto_0"})
+    assert(isinstance(ret[1]["error"], asyncio.TimeoutError))
+    assert(ret.actors[1] == "proto_1")
+    assert(all(0 < t <= 0.2 for t in calls["time_limits"]))
+    assert(calls["time_limits"][2] == 0.1)
+    assert(calls["inflight"]["proto_1"] == 0)
+
+    with pytest.raises(ProxyPartialInvokeException):
+        await invoke(proxies[0].status(10), deadline=0.05)
+
+
+@pytest.mark.asyncio
+async def test_invoke_fail_fast(slow_actors):
+
+    calls, proxies = slow_actors
+    for p in proxies:
+        p._set_commands(["status", "fail"])
+
+    ret = await invoke(proxies[0].status(0.01), proxies[1].fail(0.05), proxies[2].status(10), proxies[3].status(10),
+                       fail_fast=True, return_exceptions=True)
+
+    assert(ret[0] == {"actor": "proto_0"})
+    assert(isinstance(ret[1]["error"], ValueError))
+    assert(isinstance(ret[2]["error"], asyncio.CancelledError))
+    assert(ret.exec_times[2] is None)
+    assert(sum(calls["inflight"].values()) == 0)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02i_proxy_coalesce.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+
+from cluplus.proxy import Proxy
+
+
+@pytest.mark.asyncio
+async def test_proxy_coalesce(counting_amqpc):
+
+    amqpc = counting_amqpc
+    proxy = Proxy("proto", amqpc=amqpc, coalesce=["status"])
+
+    ret = await asyncio.gather(*[proxy.call_command("status") for i in range(5)])
+    assert(len(amqpc.sent) == 1)
+    assert(all(r == {"status": {"temp": [20.0]}} for r in ret))
+    assert(all(r.sender == "proto" for r in ret))
+
+    ret[0]["status"]["temp"].append(21.0)
+    assert(ret[1]["status"]["temp"] == [20.0])
+    assert(proxy._inflight == {})
+    assert(proxy.reply_cache.stats() == {"size": 0, "hits": 0, "misses": 0, "evictions": 0})
+
+    await asyncio.gather(proxy.call_command("status", 1), proxy.call_command("status", 2),
+                         proxy.call_command("expose", 1), proxy.call_command("expose", 1))
+    assert(sorted(amqpc.sent[1:]) == [("expose", 1), ("expose", 1), ("status", 1), ("status", 2)])
+
+
+@pytest.mark.asyncio
+async def test_proxy_coalesce_cancel(counting_amqpc):
+
+    amqpc = counting_amqpc
+    proxy = Proxy("proto", amqpc=amqpc, coalesce=["status"])
+
+    first = asyncio.ensure_future(proxy.call_command("status"))
+    await asyncio.sleep(0.01)
+    second = proxy.call_command("status")
+    first.cancel()
+
+    assert(await second == {"status": {"temp": [20.0]}})
+    assert(len(amqpc.sent) == 1)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02j_proxy_cache.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+
+from cluplus.proxy import Proxy, ReplyCache
+
+
+@pytest.mark.asyncio
+async def test_proxy_reply_cache(counting_amqpc):
+
+    amqpc = counting_amqpc
+    proxy = Proxy("proto", amqpc=amqpc, cache={"status": 0.2})
+
+    r1 = await proxy.call_command("status")
+    r1["status"]["temp"].append(21.0)
+    r2 = await proxy.call_command("status")
+    assert(r2 == {"status": {"temp": [20.0]}})
+    assert(r2.sender == "proto")
+    assert(len(amqpc.sent) == 1)
+
+    await proxy.call_command("status", 1)
+    await proxy.call_command("expose")
+    await proxy.call_command("expose")
+    assert(len(amqpc.sent) == 4)
+
+    await asyncio.sleep(0.2)
+    await proxy.call_command("status")
+    assert(len(amqpc.sent) == 5)
+
+    proxy.reply_cache.invalidate("status")
+    await proxy.call_command("status")
+    assert(len(amqpc.sent) == 6)
+
+    assert(proxy.reply_cache.stats() == {"size": 1, "hits": 1, "misses": 4, "evictions": 0})
+
+
+@pytest.mark.asyncio
+async def test_proxy_reply_cache_coalesce(counting_amqpc):
+
+    amqpc = counting_amqpc
+    proxy = Proxy("proto", amqpc=amqpc, cache={"status": 10}, coalesce=["status"])
+
+    await asyncio.gather(*[proxy.call_command("status") for i in range(3)])
+    await proxy.call_command("status")
+    assert(len(amqpc.sent) == 1)
+
+
+def test_reply_cache_lru():
+
+    cache = ReplyCache({"status": 10}, maxsize=2)
+
+    cache.put(("status", 1), {"a": 1})
+    cache.put(("status", 2), {"a": 2})
+    assert(cache.get(("status", 1)) == {"a": 1})
+    cache.put(("status", 3), {"a": 3})
+    cache.put(("expose",), {"a": 4})
+
+    assert(cache.get(("status", 2)) is None)
+    assert(cache.get(("status", 1)) == {"a": 1})
+    assert(len(cache) == 2)
+    assert(cache.evictions == 1)
+
+    cache.invalidate()
+    assert(len(cache) == 0)
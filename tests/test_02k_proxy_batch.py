@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02k_proxy_batch.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+import pytest_asyncio
+
+import json
+import asyncio
+import uuid
+
+from types import SimpleNamespace
+
+from clu import AMQPClient
+from clu.testing import setup_test_actor
+
+from cluplus.proxy import Proxy
+from cluplus.exceptions import ProxyException, ProxyPartialInvokeException
+
+from proto.actor.actor import ProtoActor
+
+
+@pytest_asyncio.fixture
+async def mock_proxy():
+
+    actor = await setup_test_actor(ProtoActor(name=f"proto_mock-{uuid.uuid4().hex[:8]}"))
+    amqpc = AMQPClient(name=f"proxy_batch-{uuid.uuid4().hex[:8]}")
+    amqpc.sent = []
+
+    async def send_command(consumer, command, *args, callback=None, time_limit=None):
+        command_string = " ".join(map(str, [command, *args]))
+        amqpc.sent.append(command_string)
+        command = await actor.invoke_mock_command(command_string)
+        await command
+        fu = asyncio.get_running_loop().create_future()
+        fu.set_result(SimpleNamespace(actor=consumer, status=command.status,
+                                      replies=[SimpleNamespace(message=actor.mock_replies[-1])]))
+        return fu
+
+    amqpc.send_command = send_command
+    yield actor, Proxy(actor.name, amqpc=amqpc)
+
+
+
+
+@pytest.mark.asyncio
+async def test_batch_command(mock_proxy):
+
+    actor, proxy = mock_proxy
+
+    command = await actor.invoke_mock_command("__batch 'setEnabled True --axis1 False' 'gotoRaDecJ2000 1.0 2.0'")
+    await command
+
+    items = [json.loads(i) for i in actor.mock_replies[-1]["help"]]
+    assert([i["command"] for i in items] == ["setEnabled", "gotoRaDecJ2000"])
+    assert(items[0]["status"] == "DONE")
+    assert(items[0]["reply"] == {"enable": True, "axis0": True, "axis1": False})
+
+
+@pytest.mark.asyncio
+async def test_batch_command_unserializable_reply(mock_proxy):
+
+    actor, proxy = mock_proxy
+
+    command = await actor.invoke_mock_command("__batch 'setEnabled True' errUnserializable 'setEnabled False'")
+    await command
+
+    items = [json.loads(i) for i in actor.mock_replies[-1]["help"]]
+    assert([i["status"] for i in items] == ["DONE", "FAILED", "DONE"])
+    assert(items[1]["reply"]["error"]["exception_type"] == "TypeError")
+
+    async with proxy.batch(return_exceptions=True) as batch:
+        enabled = batch.setEnabled(True)
+        failed = batch.add("errUnserializable")
+
+    assert(enabled.result()["enable"] == True)
+    assert(isinstance(failed.exception(), TypeError))
+
+
+@pytest.mark.asyncio
+async def test_proxy_batch(mock_proxy):
+
+    actor, proxy = mock_proxy
+
+    for concurrent in (False, True):
+        async with proxy.batch(concurrent=concurrent) as batch:
+            enabled = batch.setEnabled(True, axis1=False)
+            batch.add("setEnabled", False)
+
+        assert(len(proxy.amqpc.sent) == 1 + concurrent)
+        assert(enabled.result() == {"enable": True, "axis0": True, "axis1": False})
+        assert(batch.results[1]["enable"] == False)
+        assert(batch.results.actors == [actor.name] * 2)
+
+    with pytest.raises(ProxyPartialInvokeException):
+        async with proxy.batch() as batch:
+            batch.setEnabled(True)
+            batch.errPassAsError()
+
+    async with proxy.batch(return_exceptions=True) as batch:
+        batch.setEnabled(True)
+        failed = batch.errPassAsError()
+
+    assert("error" in batch.results[1])
+    assert(failed.exception() is batch.results[1]["error"])
+    assert(type(failed.exception()).__name__ == "ProtoActorAPIError")
+
+
+@pytest.mark.asyncio
+async def test_proxy_batch_failed(mock_proxy):
+
+    actor, proxy = mock_proxy
+
+    async def no_batch(commands, concurrent, time_limit):
+        raise ProxyException("no __batch")
+
+    proxy._call_batch = no_batch
+    with pytest.raises(ProxyException):
+        async with proxy.batch() as batch:
+            enabled = batch.setEnabled(True)
+    assert(isinstance(enabled.exception(), ProxyException))
+
+    async def slow_batch(commands, concurrent, time_limit):
+        await asyncio.sleep(10)
+
+    proxy._call_batch = slow_batch
+    batch = proxy.batch()
+    enabled = batch.setEnabled(True)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(batch.send(), 0.01)
+    assert(enabled.cancelled())
+
+    async def short_batch(commands, concurrent, time_limit):
+        return {"help": [json.dumps({"command": "setEnabled", "status": "DONE", "reply": {"enable": True}})]}
+
+    proxy._call_batch = short_batch
+    async with proxy.batch(return_exceptions=True) as batch:
+        enabled = batch.setEnabled(True)
+        missing = batch.setEnabled(False)
+
+    assert(enabled.result() == {"enable": True})
+    assert(isinstance(missing.exception(), ProxyException))
+    assert(batch.results[1]["error"] is missing.exception())
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02l_sync_proxy.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+import concurrent.futures
+
+from cluplus.proxy import SyncProxy
+
+
+def test_sync_proxy_threads(counting_amqpc):
+
+    proxy = SyncProxy("proto", amqpc=counting_amqpc)
+    proxy._proxy._set_commands(["status"])
+
+    assert(proxy.status() == {"status": {"temp": [20.0]}})
+    assert("status" in dir(proxy))
+    with pytest.raises(AttributeError):
+        proxy.expose()
+
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        ret = list(pool.map(lambda i: proxy.status(i), range(64)))
+
+    assert(len(ret) == 64 and all(r.sender == "proto" for r in ret))
+    assert(len(counting_amqpc.sent) == 65)
+    assert(SyncProxy._thread.is_alive())
+
+
+def test_sync_proxy_timeout(counting_amqpc):
+
+    proxy = SyncProxy("proto", amqpc=counting_amqpc, timeout=0.01)
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        proxy.call_command("status")
+
+
+def test_sync_proxy_not_in_loop_thread(counting_amqpc):
+
+    proxy = SyncProxy("proto", amqpc=counting_amqpc)
+
+    async def call():
+        return proxy.call_command("status")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run_coroutine_threadsafe(call(), SyncProxy._loop).result()
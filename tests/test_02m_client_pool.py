@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_02m_client_pool.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import asyncio
+import json
+
+from types import SimpleNamespace
+
+from cluplus.proxy import Client
+
+
+def pooled_client(pool_size, pool_strategy="hash"):
+
+    client = Client(pool_size=pool_size, pool_strategy=pool_strategy)
+    client.replies_queue = SimpleNamespace(name="replies")
+    client.published = []
+
+    def lane(i):
+        async def publish(message, routing_key):
+            client.published.append((i, routing_key, json.loads(message.body), message.reply_to))
+        return SimpleNamespace(exchange=SimpleNamespace(publish=publish))
+
+    client.lanes = [lane(i) for i in range(pool_size)]
+    client.lane_load = [0] * pool_size
+    return client
+
+
+@pytest.mark.asyncio
+async def test_client_pool_hash():
+
+    client = pooled_client(3)
+
+    for i in range(3):
+        for actor in ("proto_a", "proto_b", "proto_c"):
+            await client.send_command(actor, "status", await_command=False)
+
+    lanes = {}
+    for lane, routing_key, body, reply_to in client.published:
+        lanes.setdefault(routing_key, set()).add(lane)
+        assert(reply_to == "replies")
+        assert(body == {"command_string": "status"})
+
+    assert(all(len(l) == 1 for l in lanes.values()))
+    assert(sum(client.lane_load) == 9)
+
+
+@pytest.mark.asyncio
+async def test_client_pool_least_loaded():
+
+    client = pooled_client(3, "least_loaded")
+
+    commands = [await client.send_command("proto", "status", await_command=False) for i in range(6)]
+    assert([l for l, _, _, _ in client.published] == [0, 1, 2, 0, 1, 2])
+    assert(client.lane_load == [2, 2, 2])
+
+    commands[0].set_result(commands[0])
+    commands[3].set_result(commands[3])
+    await asyncio.sleep(0)
+    assert(client.lane_load == [0, 2, 2])
+
+    await client.send_command("proto", "status", await_command=False)
+    assert(client.published[-1][0] == 0)
+
+
+def test_client_pool_default():
+
+    client = Client()
+    assert(client.pool_size == 1)
+    assert(client._select_lane("proto") == 0)
+
+    with pytest.raises(ValueError):
+        Client(pool_strategy="random")
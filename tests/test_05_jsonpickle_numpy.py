@@ -17,7 +17,8 @@ from clu import AMQPClient, CommandStatus
 
 from cluplus import __version__
 from cluplus.proxy import Proxy, invoke, unpack
-from cluplus.parsers.jsonpickle import pickle, unpickle, JsonPickleParamType
+from cluplus.parsers import jsonpickle
+from cluplus.parsers.jsonpickle import pickle, unpickle, JsonPickleParamType, register_ndarray_handlers, unregister_ndarray_handlers
 
 from proto.actor.actor import ProtoActor
 
@@ -78,6 +79,70 @@ def test_pickle_unpickle():
     assert((aa == bb).all())
 
 
+@pytest.fixture
+def binary_ndarrays():
+    register_ndarray_handlers()
+    yield
+    if not jsonpickle.binary_ndarrays:
+        unregister_ndarray_handlers()
+
+
+def test_pickle_unpickle_binary_ndarray(binary_ndarrays):
+
+    arr = np.asfortranarray(np.arange(12.).reshape(3, 4))
+    arr_copy = unpickle(pickle(arr))
+    assert((arr == arr_copy).all())
+    assert(arr_copy.flags.f_contiguous)
+
+    arr = np.arange(24).reshape(2, 3, 4)[:, ::2]
+    assert((arr == unpickle(pickle(arr))).all())
+
+    arr = np.zeros(2, dtype=[('a', '<f8', (2, 3)), ('b', [('c', 'i4')])])
+    assert((arr == unpickle(pickle(arr))).all())
+
+    arr = np.array([{'a': 1}, None, [1, 2]], dtype=object)
+    assert(list(unpickle(pickle(arr))) == list(arr))
+
+    data = {'frame': np.ones((4, 4), dtype=np.uint16), 'time': np.zeros(3, dtype='M8[s]')}
+    data_copy = unpickle(pickle(data))
+    assert((data['frame'] == data_copy['frame']).all())
+    assert(data_copy['time'].dtype == data['time'].dtype)
+    assert(data_copy['frame'].flags.writeable)
+
+    arr = np.ma.masked_array([1., 2., 3.], [0, 1, 0], fill_value=-1.)
+    arr_copy = unpickle(pickle(arr))
+    assert(isinstance(arr_copy, np.ma.MaskedArray))
+    assert(arr_copy.mask.tolist() == [False, True, False])
+    assert(arr_copy.fill_value == -1. and arr_copy.sum() == 4.)
+
+    arr = np.rec.fromrecords([(1, 2.0)], names="a,b")
+    assert('"b64"' in pickle(arr) and unpickle(pickle(arr)).b[0] == 2.0)
+
+
+def test_unpickle_generic_ndarray():
+
+    bright = np.rec.array([(1,'Sirius', -1.45, 'A1V'),
+                        (2,'Canopus', -0.73, 'F0Ib'),
+                        (3,'Rigil Kent', -0.1, 'G2V')],
+                        formats='int16,a20,float32,a10',
+                        names='order,name,mag,Sp')
+
+    a = pickle(bright)
+    assert('"b64"' not in a)
+    assert((bright == unpickle(a)).all())
+
+    register_ndarray_handlers()
+    try:
+        assert((bright == unpickle(a)).all())
+        b = pickle(bright)
+    finally:
+        unregister_ndarray_handlers()
+
+    # binary payloads of peers are decoded without the encoding enabled.
+    assert('"b64"' in b)
+    assert((bright == unpickle(b)).all())
+
+
 @pytest.mark.asyncio
 async def test_proxy_json_simple(amqp_client, proto_test_actor):
 
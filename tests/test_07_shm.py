@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_07_shm.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+import pytest_asyncio
+
+import os
+import json
+import uuid
+import asyncio
+
+import click
+
+from types import SimpleNamespace
+
+from clu import AMQPClient
+
+from cluplus import shm
+from cluplus.exceptions import ProxySharedMemoryException
+from cluplus.proxy import Proxy, unpack
+from cluplus.parsers.jsonpickle import pickle, unpickle, JsonPickleParamType
+from cluplus.parsers.jsonstring import JsonStringParamType
+
+import numpy as np
+
+
+@pytest_asyncio.fixture(scope="session")
+async def amqp_client(proto_test_actor, event_loop):
+
+    client = AMQPClient(name=f"{proto_test_actor.name}_client-{uuid.uuid4().hex[:8]}")
+    await client.start()
+
+    yield client
+
+    await client.stop()
+
+
+@pytest.fixture
+def small_shm_threshold():
+    threshold = shm.shm_threshold
+    shm.shm_threshold = 16
+    yield
+    shm.shm_threshold = threshold
+
+
+def test_shm_pickle_unpickle(small_shm_threshold):
+
+    arr = np.arange(100.)
+
+    a = pickle(arr, use_shm=True)
+    assert(shm.is_shm_handle(a))
+    path = json.loads(a[1:-1])[shm.SHM_MARKER]["path"]
+    assert(os.path.exists(path))
+
+    assert((unpickle(a) == arr).all())
+    assert(not os.path.exists(path))
+
+    assert(not shm.is_shm_handle(pickle(1, use_shm=True)))
+
+
+def test_shm_paramtypes(small_shm_threshold):
+
+    arr = np.arange(100.)
+    assert((JsonPickleParamType().convert(pickle(arr, use_shm=True)[1:-1], None, None) == arr).all())
+
+    data = {"a": list(range(100))}
+    assert(JsonStringParamType().convert(shm.shm_put(json.dumps(data)), None, None) == data)
+
+    with pytest.raises(click.exceptions.BadParameter):
+        JsonStringParamType().convert(json.dumps({shm.SHM_MARKER: {"host": "elsewhere", "path": "/nope"}}), None, None)
+
+
+def test_shm_private(small_shm_threshold, monkeypatch):
+
+    handle = shm.shm_put("x" * 100)
+    path = json.loads(handle)[shm.SHM_MARKER]["path"]
+    assert(os.stat(path).st_mode & 0o777 == 0o600)
+
+    def unlink(path):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(shm.os, "unlink", unlink)
+    with pytest.raises(ValueError):
+        shm.shm_get(handle)
+    with pytest.raises(click.exceptions.BadParameter):
+        JsonStringParamType().convert(handle, None, None)
+    monkeypatch.undo()
+    shm.shm_release(handle)
+
+
+def test_shm_release(small_shm_threshold):
+
+    handle = shm.shm_put("x" * 100)
+    shm.shm_release(handle)
+    shm.shm_release(handle)
+
+    with pytest.raises(ProxySharedMemoryException):
+        shm.shm_get(handle)
+
+
+@pytest.mark.asyncio
+async def test_proxy_shm_numpy_array(amqp_client, proto_test_actor, small_shm_threshold):
+
+    proto_proxy = Proxy(proto_test_actor.name, amqpc=amqp_client, use_shm=True)
+    await proto_proxy.start()
+
+    arr = np.vander(np.linspace(0, 1, 1200), 2)
+
+    arr_ret = unpickle(unpack(await proto_proxy.bigData(pickle(arr, use_shm=True))))
+    assert((arr == arr_ret).all())
+
+
+def test_shm_foreign_paths(tmp_path):
+
+    from socket import gethostname
+
+    secret = tmp_path / "secret"
+    secret.write_text("not json")
+    link = os.path.join(shm.SHM_DIR, f"cluplus-{uuid.uuid4().hex}")
+    os.symlink(secret, link)
+
+    try:
+        for path in (str(secret), link, os.path.join(shm.SHM_DIR, "cluplus-nothex"),
+                     os.path.join(shm.SHM_DIR, "..", "etc", "passwd")):
+            handle = json.dumps({shm.SHM_MARKER: {"host": gethostname(), "path": path}})
+            with pytest.raises(ProxySharedMemoryException):
+                shm.shm_get(handle)
+            with pytest.raises(ProxySharedMemoryException):
+                shm.shm_release(handle)
+            with pytest.raises(click.exceptions.BadParameter) as ex:
+                JsonStringParamType().convert(handle, None, None)
+            assert("not json" not in str(ex.value))
+
+        assert(secret.exists() and os.path.islink(link))
+
+    finally:
+        os.unlink(link)
+
+    with pytest.raises(ProxySharedMemoryException):
+        shm.shm_get(json.dumps({shm.SHM_MARKER: "x"}))
+
+
+def test_shm_invalid_payload_not_echoed(small_shm_threshold):
+
+    handle = shm.shm_put("secret payload")
+    with pytest.raises(click.exceptions.BadParameter) as ex:
+        JsonStringParamType().convert(handle, None, None)
+    assert("secret payload" not in str(ex.value))
+
+
+@pytest.mark.asyncio
+async def test_shm_release_only_with_time_limit(counting_amqpc, small_shm_threshold):
+
+    from socket import gethostname
+
+    later = []
+    counting_amqpc.loop = SimpleNamespace(call_later=lambda delay, cb: later.append(delay))
+
+    proxy = Proxy("proto", amqpc=counting_amqpc, use_shm=True)
+    proxy._actor_host = gethostname()
+
+    await proxy.call_command("bigData", {"a": list(range(100))}, time_limit=None)
+    await proxy.call_command("bigData", {"a": list(range(100))}, time_limit=5.0)
+    assert(later == [5.0])
+
+    for _, handle in counting_amqpc.sent:
+        shm.shm_release(handle)
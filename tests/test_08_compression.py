@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_08_compression.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import json
+import click
+
+from cluplus import compression
+from cluplus.parsers.jsonpickle import pickle, unpickle, JsonPickleParamType
+from cluplus.parsers.jsonstring import JsonStringParamType
+
+from proto.actor.commands.complex_data_with_jsonstring import fits_dict
+
+import numpy as np
+
+
+@pytest.fixture
+def small_compress_threshold():
+    threshold = compression.compress_threshold
+    compression.compress_threshold = 64
+    yield
+    compression.compress_threshold = threshold
+
+
+def test_compress_codecs():
+
+    payload = json.dumps(fits_dict)
+    for codec in compression.codecs:
+        z = compression.compress(payload, codec)
+        assert(compression.is_compressed(z))
+        assert(len(z) < len(payload))
+        assert(compression.decompress(z) == payload)
+        assert(compression.decompress(f"'{z}'") == payload)
+
+
+def test_compress_threshold(small_compress_threshold):
+
+    assert(compression.maybe_compress("[1, 2]") == "[1, 2]")
+    assert(compression.is_compressed(compression.maybe_compress(json.dumps(fits_dict))))
+    assert(compression.maybe_decompress("[1, 2]") == "[1, 2]")
+
+
+def test_compress_pickle_paramtypes(small_compress_threshold):
+
+    arr = np.zeros(1000)
+    a = pickle(arr)
+    assert(compression.is_compressed(a))
+    assert((unpickle(a) == arr).all())
+    assert((JsonPickleParamType().convert(a[1:-1], None, None) == arr).all())
+
+    assert(JsonStringParamType().convert(compression.compress(json.dumps(fits_dict)), None, None) == fits_dict)
+
+
+def test_compress_malformed():
+
+    for value in ('{"cluplus/z": {"codec": "zlib", "b64": "bm90IHpsaWI="}}',
+                  '{"cluplus/z": {"codec": "nope", "b64": ""}}',
+                  '{"cluplus/z": {"codec": "zlib", "b64": "###"}}'):
+        assert(compression.is_compressed(value))
+        with pytest.raises(ValueError):
+            compression.decompress(value)
+        for param_type in (JsonStringParamType, JsonPickleParamType):
+            with pytest.raises(click.BadParameter):
+                param_type().convert(value, None, None)
+
+    # user json is not mistaken for a compressed payload.
+    for value in ('{"cluplus/zoo": 1}', '{"cluplus/z": 1}', '{"cluplus/z": {"codec": "zlib", "b64": "x"}, "a": 1}'):
+        assert(not compression.is_compressed(value))
+        assert(JsonStringParamType().convert(value, None, None) == json.loads(value))
+
+    with pytest.raises(ValueError):
+        compression.decompress("[1, 2]")
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_09_signatures.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+import pytest_asyncio
+
+import json
+import uuid
+
+from clu import AMQPClient
+from clu.testing import setup_test_actor
+
+from cluplus.proxy import Proxy
+from cluplus.signatures import compile_encoder
+from cluplus.exceptions import ProxyCommandArgumentsException
+
+from proto.actor.actor import ProtoActor
+
+
+@pytest_asyncio.fixture
+async def mock_actor():
+
+    yield await setup_test_actor(ProtoActor(name=f"proto_mock-{uuid.uuid4().hex[:8]}"))
+
+
+async def pull_signatures(actor):
+
+    command = await actor.invoke_mock_command("__commands --signatures")
+    await command
+    return {s["name"]: s for s in map(json.loads, actor.mock_replies[-1]["help"])}
+
+
+@pytest.mark.asyncio
+async def test_commands_signatures(mock_actor):
+
+    signatures = await pull_signatures(mock_actor)
+
+    assert([p["name"] for p in signatures["setEnabled"]["params"]] == ["enable", "axis0", "axis1"])
+    assert(signatures["setEnabled"]["params"][0]["type"] == "boolean")
+    assert(signatures["setEnabled"]["params"][1]["default"] == True)
+    assert(signatures["moreBigData"]["params"][3]["opts"] == ["--optData"])
+
+    command = await mock_actor.invoke_mock_command("__commands")
+    await command
+    assert("setEnabled" in mock_actor.mock_replies[-1]["help"])
+
+
+@pytest.mark.asyncio
+async def test_compiled_encoder(mock_actor):
+
+    signatures = await pull_signatures(mock_actor)
+
+    encoder = compile_encoder(signatures["setEnabled"])
+    args = encoder((True,), {"axis1": False}, str)
+    assert(args == [True, "--axis1", False])
+
+    command = await mock_actor.invoke_mock_command("setEnabled " + " ".join(map(str, args)))
+    await command
+    assert(mock_actor.mock_replies[-1] == {'enable': True, 'axis0': True, 'axis1': False})
+
+    encoder = compile_encoder(signatures["moreBigData"])
+    assert(encoder(("'1'", "'2'", 3), {"optdata": "'4'"}, str) == ["'1'", "'2'", 3, "--optData", "'4'"])
+
+    for args, kwargs in [((), {}), ((True, 1), {}), (({"a": 1},), {}), ((True,), {"axis2": True})]:
+        with pytest.raises(ProxyCommandArgumentsException):
+            compile_encoder(signatures["setEnabled"])(args, kwargs, str)
+
+    with pytest.raises(ProxyCommandArgumentsException):
+        compile_encoder(signatures["gotoRaDecJ2000"])((1.0, [2]), {}, str)
+
+
+@pytest.mark.asyncio
+async def test_compiled_encoder_nargs_and_secondary_opts(mock_actor):
+
+    signatures = await pull_signatures(mock_actor)
+    assert(signatures["moveTo"]["params"][2]["secondary_opts"] == ["--no-track"])
+
+    encoder = compile_encoder(signatures["moveTo"])
+    assert(encoder((1.0, 2.0), {}, str) == [1.0, 2.0])
+    assert(encoder(((1.0, 2.0),), {}, str) == [1.0, 2.0])
+    assert(encoder(([1.0, 2.0],), {"offset": (0.5, 0.5), "track": False}, str) == [1.0, 2.0, "--offset", 0.5, 0.5, "--no-track"])
+    assert(encoder((1.0, 2.0), {"track": True}, str) == [1.0, 2.0, "--track"])
+    assert(encoder((1.0, 2.0), {"no_track": True}, str) == [1.0, 2.0, "--no-track"])
+
+    for args, kwargs in [((1.0,), {}), ((1.0, 2.0, 3.0), {}), (((1.0, 2.0, 3.0),), {}), ((1.0, 2.0), {"offset": 1.0})]:
+        with pytest.raises(ProxyCommandArgumentsException):
+            encoder(args, kwargs, str)
+
+    command = await mock_actor.invoke_mock_command("moveTo " + " ".join(map(str, encoder(((1.0, 2.0),), {"offset": (3, 4), "track": False}, str))))
+    await command
+    assert(mock_actor.mock_replies[-1] == {"position": [1.0, 2.0], "offset": [3.0, 4.0], "track": False})
+
+
+@pytest.mark.asyncio
+async def test_compiled_encoder_choice_count_and_variadic(mock_actor):
+
+    signatures = await pull_signatures(mock_actor)
+    assert(signatures["setFilter"]["params"][0]["case_sensitive"] == False)
+    assert(signatures["setFilter"]["params"][1]["count"] == True)
+
+    encoder = compile_encoder(signatures["setFilter"])
+    assert(encoder(("red",), {}, str) == ["red"])
+    assert(encoder(("BLUE",), {"verbose": 3}, str) == ["BLUE", "--verbose", "--verbose", "--verbose"])
+    assert(encoder(("Green",), {"v": 0}, str) == ["Green"])
+
+    for args, kwargs in [(("yellow",), {}), (("red",), {"verbose": -1}), (("red",), {"verbose": "2"})]:
+        with pytest.raises(ProxyCommandArgumentsException):
+            encoder(args, kwargs, str)
+
+    command = await mock_actor.invoke_mock_command("setFilter " + " ".join(encoder(("red",), {"verbose": 2}, str)))
+    await command
+    assert(mock_actor.mock_replies[-1] == {"filter": "Red", "verbose": 2})
+
+    # a variadic argument before others can't be matched locally, the command is sent unvalidated.
+    assert(compile_encoder(signatures["copyTo"]) is None)
+
+
+@pytest.mark.asyncio
+async def test_proxy_fails_locally(mock_actor):
+
+    signatures = await pull_signatures(mock_actor)
+
+    proxy = Proxy(mock_actor.name, amqpc=AMQPClient(name=f"proxy_signatures-{uuid.uuid4().hex[:8]}"))
+    proxy._set_commands(list(signatures), list(signatures.values()))
+
+    with pytest.raises(ProxyCommandArgumentsException):
+        await proxy.gotoRaDecJ2000(1.0)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_10_jsonbackend.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import json
+import math
+
+from cluplus import jsonbackend
+from cluplus.parsers.jsonstring import JsonStringParamType
+
+from proto.actor.commands.complex_data_with_jsonstring import fits_dict, list_data, dict_data, mixed_data
+
+
+@pytest.fixture(params=list(jsonbackend.backends) + ["auto"])
+def backend(request):
+    previous = jsonbackend.backend
+    jsonbackend.use(request.param)
+    yield request.param
+    jsonbackend.use(previous)
+
+
+def test_jsonbackend_roundtrip(backend):
+
+    for data in [fits_dict, list_data, dict_data, mixed_data, [2**70, -0.0, 5e-324], {"a/b": "é'\""}]:
+        assert(jsonbackend.loads(jsonbackend.dumps(data)) == data)
+        assert(json.loads(jsonbackend.dumps(data)) == data)
+        assert(JsonStringParamType().convert(json.dumps(data), None, None) == data)
+
+    assert(math.isnan(jsonbackend.loads(jsonbackend.dumps([float("nan")]))[0]))
+
+    # the wire format is the one of the stdlib json.
+    for data in [{"a": 1.5}, [1e-7, "é/"]]:
+        assert(jsonbackend.dumps(data) == json.dumps(data))
+
+    from decimal import Decimal
+    with pytest.raises(TypeError):
+        jsonbackend.dumps(Decimal("1.5"))
+
+
+def test_jsonbackend_select():
+
+    with pytest.raises(ValueError):
+        jsonbackend.use("nojson")
+
+    previous = jsonbackend.backend
+    jsonbackend.register_backend("upper", loads=lambda s: json.loads(s.upper()))
+    try:
+        jsonbackend.use("upper")
+        assert(jsonbackend.backend == "upper")
+        assert(jsonbackend.loads('["a"]') == ["A"])
+        assert(jsonbackend.dumps(["a"]) == '["a"]')
+
+    finally:
+        del jsonbackend.backends["upper"]
+        jsonbackend.use(previous)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_11_offload.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import json
+import asyncio
+import threading
+
+import click
+
+from cluplus import offload
+from cluplus.parsers.jsonpickle import pickle, unpickle, unpickle_async, JsonPickleParamType
+from cluplus.parsers.jsonstring import JsonStringParamType
+
+from proto.actor.commands.complex_data_with_jsonstring import fits_dict
+
+import numpy as np
+
+
+@pytest.fixture
+def small_offload_threshold():
+    threshold = offload.offload_threshold
+    offload.offload_threshold = 1024
+    yield
+    offload.offload_threshold = threshold
+    offload.use("thread")
+
+
+@pytest.mark.asyncio
+async def test_offload_run(small_offload_threshold):
+
+    def decode(payload):
+        return threading.current_thread(), json.loads(payload)
+
+    thread, value = await offload.run(decode, json.dumps([1]))
+    assert(thread is threading.current_thread() and value == [1])
+
+    thread, value = await offload.run(decode, json.dumps(list(range(1000))))
+    assert(thread is not threading.current_thread() and value == list(range(1000)))
+
+    offload.offload_threshold = 0
+    thread, value = await offload.run(decode, json.dumps(list(range(1000))))
+    assert(thread is threading.current_thread())
+
+
+@pytest.mark.asyncio
+async def test_unpickle_async(small_offload_threshold):
+
+    data = np.random.random((64, 64))
+    small = {"a": 1}
+
+    assert(np.array_equal(await unpickle_async(pickle(data)), data))
+    assert(await unpickle_async(pickle(small)) == small)
+
+    d, s = await unpickle_async(*pickle(data, small))
+    assert(np.array_equal(d, data) and s == small)
+
+    offload.use("process", 1)
+    assert(np.array_equal(await unpickle_async(pickle(data)), data))
+
+
+@pytest.mark.asyncio
+async def test_param_types_offload(small_offload_threshold):
+
+    data = np.random.random((64, 64))
+
+    value = JsonPickleParamType(offload=True).convert(pickle(data)[1:-1], None, None)
+    assert(isinstance(value, asyncio.Future))
+    assert(np.array_equal(await value, data))
+
+    value = JsonStringParamType(offload=True).convert(json.dumps(fits_dict), None, None)
+    assert(await value == fits_dict)
+
+    assert(JsonStringParamType().convert(json.dumps(fits_dict), None, None) == fits_dict)
+
+
+@pytest.mark.asyncio
+async def test_param_types_offload_malformed(small_offload_threshold):
+
+    for param_type in (JsonStringParamType, JsonPickleParamType):
+        with pytest.raises(click.BadParameter):
+            param_type(offload=True).convert("{" * 10, None, None)
+
+        value = param_type(offload=True).convert("{" * 2048, None, None)
+        with pytest.raises(click.BadParameter) as ex:
+            await value
+        assert("is not a valid" in str(ex.value))
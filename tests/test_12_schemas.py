@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# @Author: agent (agent@local)
+# @Date: 2026-10-18
+# @Filename: test_12_schemas.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+
+import pytest
+
+import json
+import uuid
+import asyncio
+
+import numpy as np
+
+from types import SimpleNamespace
+from datetime import datetime, date, timezone
+
+from clu import AMQPClient, CommandStatus
+from clu.testing import setup_test_actor
+
+from cluplus.proxy import Proxy, ProxyDict
+from cluplus.schemas import compile_decoder
+
+from proto.actor.actor import ProtoActor
+
+
+schema = {
+    "type": "object",
+    "definitions": {
+        "position": {"type": "array", "items": {"type": "number"}},
+    },
+    "properties": {
+        "temperatures": {"type": "array", "items": {"type": "number"}},
+        "counts": {"type": ["array", "null"], "items": {"type": "integer"}},
+        "image": {"type": "array", "items": {"type": "array", "items": {"type": "integer"}}},
+        "date_obs": {"type": "string", "format": "date-time"},
+        "night": {"type": "string", "format": "date"},
+        "name": {"type": "string"},
+        "state": {"type": "object",
+                  "properties": {"pos": {"$ref": "#/definitions/position"},
+                                 "mode": {"type": "string"}}},
+        "history": {"type": "array", "items": {"type": "object", "properties": {"pos": {"$ref": "#/definitions/position"}}}},
+    },
+    "additionalProperties": True,
+}
+
+
+def test_schema_decoder():
+
+    decode = compile_decoder(schema)
+
+    msg = decode({"temperatures": [1, 2.5],
+                  "counts": None,
+                  "image": [[1, 2], [3, 4]],
+                  "date_obs": "2026-10-18T01:02:03Z",
+                  "night": "2026-10-17",
+                  "name": "proto",
+                  "state": {"pos": [1.0, 2.0], "mode": "a"},
+                  "history": [{"pos": [3, 4]}],
+                  "extra": [1, 2]})
+
+    assert(msg["temperatures"].dtype == np.float64 and msg["temperatures"].tolist() == [1.0, 2.5])
+    assert(msg["counts"] is None)
+    assert(msg["image"].shape == (2, 2) and msg["image"].dtype == np.int64)
+    assert(msg["date_obs"] == datetime(2026, 10, 18, 1, 2, 3, tzinfo=timezone.utc))
+    assert(msg["night"] == date(2026, 10, 17))
+    assert(msg["name"] == "proto" and msg["state"]["mode"] == "a")
+    assert(isinstance(msg["state"]["pos"], np.ndarray))
+    assert(isinstance(msg["history"][0]["pos"], np.ndarray))
+    assert(msg["extra"] == [1, 2])
+
+    # values the schema does not describe are passed through.
+    assert(decode({"date_obs": "yesterday", "image": [[1], [2, 3]]}) == {"date_obs": "yesterday", "image": [[1], [2, 3]]})
+
+
+def test_schema_decoder_nothing_to_decode():
+
+    assert(compile_decoder({"type": "object", "properties": {}, "additionalProperties": True}) is None)
+    assert(compile_decoder({"type": "object", "properties": {"name": {"type": "string"}}}) is None)
+
+    recursive = {"definitions": {"node": {"type": "object", "properties": {"child": {"$ref": "#/definitions/node"}}}},
+                 "properties": {"tree": {"$ref": "#/definitions/node"}}}
+    assert(compile_decoder(recursive) is None)
+
+
+@pytest.mark.asyncio
+async def test_actor_schema():
+
+    actor = await setup_test_actor(ProtoActor(name=f"proto_mock-{uuid.uuid4().hex[:8]}"))
+    command = await actor.invoke_mock_command("get_schema")
+    await command
+
+    assert(compile_decoder(json.loads(actor.mock_replies[-1]["schema"])) is None)
+
+
+@pytest.mark.asyncio
+async def test_proxy_typed():
+
+    amqpc = AMQPClient(name=f"typed-{uuid.uuid4().hex[:8]}")
+    amqpc.sent = []
+    actor = f"proto-{uuid.uuid4().hex[:8]}"
+
+    async def send_command(actor, command, *args, callback=None, time_limit=None):
+        amqpc.sent.append(command)
+        message = {"schema": json.dumps(schema)} if command == "get_schema" else {"temperatures": [20, 21]}
+        fu = asyncio.get_running_loop().create_future()
+        fu.set_result(SimpleNamespace(actor=actor,
+                                      status=CommandStatus.DONE,
+                                      replies=[SimpleNamespace(message=message)]))
+        return fu
+
+    amqpc.send_command = send_command
+
+    proxy = Proxy(actor, amqpc=amqpc, typed=True)
+    await proxy._load_schema()
+    await Proxy(actor, amqpc=amqpc, typed=True)._load_schema()
+    assert(amqpc.sent == ["get_schema"])
+
+    # a new actor version or catalogue has its own decoder.
+    await proxy._load_schema(("1.0", "a"))
+    await proxy._load_schema(("1.0", "a"))
+    await proxy._load_schema(("1.1", "a"))
+    assert(amqpc.sent == ["get_schema"] * 3)
+    assert([k for k in Proxy.schema_decoders if k[0] == actor] == [(actor, ("1.1", "a"))])
+
+    reply = await proxy.call_command("status")
+    assert(isinstance(reply, ProxyDict) and reply.sender == actor)
+    assert(reply["temperatures"].tolist() == [20.0, 21.0])
+
+    replies = []
+    proxy._handle_callback(replies.append, SimpleNamespace(body={"temperatures": [1]}, message_code=">", sender=actor))
+    assert(isinstance(replies[0]["temperatures"], np.ndarray))
+
+    assert(isinstance((await Proxy(actor, amqpc=amqpc).call_command("status"))["temperatures"], list))
+
+
+@pytest.mark.asyncio
+async def test_typed_proxy_schema_from_commands_cache(tmp_path, monkeypatch):
+
+    amqpc = AMQPClient(name=f"typed-{uuid.uuid4().hex[:8]}")
+    amqpc.sent = []
+    actor = f"proto-{uuid.uuid4().hex[:8]}"
+    monkeypatch.setattr(Proxy, "commands_cache", str(tmp_path))
+
+    async def send_command(actor, command, *args, callback=None, time_limit=None):
+        amqpc.sent.append(command)
+        if command == "get_schema":
+            message = {"schema": json.dumps(schema)}
+        elif command == "__commands":
+            message = {"help": [json.dumps({"name": "status", "params": []})], "version": "1.0"}
+        else:
+            message = {"temperatures": [20, 21]}
+        fu = asyncio.get_running_loop().create_future()
+        fu.set_result(SimpleNamespace(actor=actor,
+                                      status=CommandStatus.DONE,
+                                      replies=[SimpleNamespace(message=message)]))
+        return fu
+
+    amqpc.send_command = send_command
+
+    await Proxy(actor, amqpc=amqpc, typed=True)._query_commands()
+    assert(amqpc.sent == ["__commands", "get_schema"])
+
+    # a new process starts with the schema from the cache, revalidation does not fetch it again.
+    for k in [k for k in Proxy.schema_decoders if k[0] == actor]:
+        del Proxy.schema_decoders[k]
+    amqpc.sent.clear()
+
+    proxy = Proxy(actor, amqpc=amqpc, typed=True)
+    assert(proxy._load_commands_cache() and proxy._decoder)
+    assert(isinstance((await proxy.call_command("status"))["temperatures"], np.ndarray))
+
+    await proxy._query_commands()
+    assert(amqpc.sent == ["status", "__commands"])
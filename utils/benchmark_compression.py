@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# @Filename: benchmark_compression.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+finds the payload size where compression beats raw transfer for a given link bandwidth.
+
+    python utils/benchmark_compression.py [bandwidth_mb_per_s]
+'''
+
+import sys
+import json
+from time import perf_counter
+
+import numpy as np
+
+from cluplus import compression
+from cluplus.parsers.jsonpickle import pickle
+
+
+def payloads(size):
+    rng = np.random.default_rng(42)
+    rows = max(1, size // 64)
+    table = [[f"KEY{i % 512:04d}", float(rng.normal()), "comment for the header card"] for i in range(rows)]
+    yield "fits table", json.dumps(table)[:size]
+    yield "float array", pickle(rng.normal(size=max(1, size // 11)))[1:-1][:size]
+
+
+def main(bandwidth):
+    bw = bandwidth * 2**20
+    print(f"{'payload':>12} {'KB':>8} {'codec':>6} {'ratio':>6} {'raw ms':>8} {'z ms':>8}")
+    for size in [2**k for k in range(10, 25, 2)]:
+        for name, payload in payloads(size):
+            for codec in compression.codecs:
+                t0 = perf_counter()
+                z = compression.compress(payload, codec)
+                compression.decompress(z)
+                dt = perf_counter() - t0
+                raw, packed = len(payload) / bw, dt + len(z) / bw
+                print(f"{name:>12} {len(payload) // 1024:>8} {codec:>6} {len(z) / len(payload):>6.2f} "
+                      f"{raw * 1e3:>8.2f} {packed * 1e3:>8.2f}{' *' if packed < raw else ''}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
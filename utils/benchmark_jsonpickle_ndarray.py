@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+#
+# @Filename: benchmark_jsonpickle_ndarray.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+compares encode/decode time and wire size of the binary ndarray encoding
+against the generic jsonpickle encoding.
+
+    python utils/benchmark_jsonpickle_ndarray.py [size_mb ...]
+'''
+
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from cluplus.parsers.jsonpickle import pickle, unpickle, register_ndarray_handlers, unregister_ndarray_handlers
+
+
+def measure(data):
+    t0 = perf_counter()
+    wire = pickle(data)
+    t1 = perf_counter()
+    unpickle(wire)
+    t2 = perf_counter()
+    return t1 - t0, t2 - t1, len(wire)
+
+
+def main(sizes):
+    print(f"{'MB':>6} {'mode':>8} {'encode s':>10} {'decode s':>10} {'wire MB':>10} {'ratio':>7}")
+    for mb in sizes:
+        frame = np.random.default_rng(42).normal(size=int(mb * 2**20) // 8)
+        for mode, register in (("generic", unregister_ndarray_handlers), ("binary", register_ndarray_handlers)):
+            register()
+            enc, dec, size = measure(frame)
+            print(f"{mb:>6} {mode:>8} {enc:>10.3f} {dec:>10.3f} {size / 2**20:>10.1f} {size / frame.nbytes:>7.2f}")
+    unregister_ndarray_handlers()
+
+
+if __name__ == "__main__":
+    main([float(a) for a in sys.argv[1:]] or [1, 10, 50, 200])
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# @Filename: benchmark_replies.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+per reply cpu time and allocations of the proxy callback path for high rate telemetry replies.
+
+    python utils/benchmark_replies.py [replies]
+'''
+
+import sys
+import json
+import tracemalloc
+from time import perf_counter
+from types import SimpleNamespace
+
+import numpy as np
+
+from clu import AMQPClient, CommandStatus
+
+from cluplus.proxy import Proxy, ProxyDict
+from cluplus.schemas import compile_decoder
+
+
+schema = {"type": "object", "properties": {"position": {"type": "array", "items": {"type": "integer"}}}}
+
+
+def telemetry(n):
+    for i in range(n):
+        body = {"temperature": 12.5 + i, "position": [i, i + 1, i + 2], "state": "tracking", "seq": i}
+        raw = json.dumps(body).encode()
+        yield SimpleNamespace(message=SimpleNamespace(body=raw), body=json.loads(raw), message_code=">", sender="lvm.sci.agcam")
+
+
+def handle_callback_reparse(callback, reply):
+    msg = ProxyDict(json.loads(reply.message.body))
+    msg.command_status = CommandStatus.code_to_status(reply.message_code)
+    msg.sender = reply.sender
+    callback(msg)
+
+
+def handle_callback_by_hand(callback, reply):
+    # the typed baseline, the same conversion written out.
+    msg = ProxyDict(reply.body)
+    msg["position"] = np.asarray(msg["position"], dtype=np.int64)
+    msg.command_status = CommandStatus.code_to_status(reply.message_code)
+    msg.sender = reply.sender
+    callback(msg)
+
+
+def measure(handler, replies):
+    # time and memory in separate runs, tracemalloc slows down allocations.
+    keep = []
+    t0 = perf_counter()
+    for r in replies:
+        handler(keep.append, r)
+    dt = perf_counter() - t0
+    keep = []
+    tracemalloc.start()
+    for r in replies:
+        handler(keep.append, r)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, size
+
+
+def main(n):
+    replies = list(telemetry(n))
+    amqpc = AMQPClient(name="benchmark_replies")
+    proxy = Proxy("lvm.sci.agcam", amqpc=amqpc)
+    typed = Proxy("lvm.sci.agcam", amqpc=amqpc, typed=True)
+    typed._decoder = compile_decoder(schema)
+    for name, handler in (("reparse", handle_callback_reparse), ("current", proxy._handle_callback),
+                          ("by hand", handle_callback_by_hand), ("typed", typed._handle_callback)):
+        measure(handler, replies[:1000])
+        dt, size = measure(handler, replies)
+        print(f"{name:>8} {dt / n * 1e6:8.2f} us/reply {size / n:8.0f} bytes/reply  {n / dt:10.0f} replies/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
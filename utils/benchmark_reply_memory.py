@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# @Filename: benchmark_reply_memory.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+memory of buffered replies, a dict with attributes like ProxyDict before slots, ProxyDict and CompactProxyDict.
+
+    python utils/benchmark_reply_memory.py [replies]
+'''
+
+import sys
+import json
+import tracemalloc
+from time import perf_counter
+
+from clu import CommandStatus
+
+from cluplus.proxy import ProxyDict, CompactProxyDict
+
+
+class AttrDict(dict):
+    """ ProxyDict without slots """
+
+
+def bodies(n):
+    for i in range(n):
+        # decoded per reply like clu does, every reply has its own key strings.
+        yield json.loads(json.dumps({"temperature": 12.5 + i, "position": [i, i + 1],
+                                     "state": {"mode": "tracking", "seq": i}}))
+
+
+def buffer(reply_type, replies):
+    keep = []
+    for body in replies:
+        msg = reply_type(body)
+        msg.sender = "lvm.sci.agcam"
+        msg.command_status = CommandStatus.RUNNING
+        keep.append(msg)
+    return keep
+
+
+def measure(reply_type, n):
+    replies = list(bodies(n))
+    t0 = perf_counter()
+    buffer(reply_type, replies)
+    dt = perf_counter() - t0
+
+    tracemalloc.start()
+    keep = buffer(reply_type, bodies(n))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, size
+
+
+def main(n):
+    for reply_type in (AttrDict, ProxyDict, CompactProxyDict):
+        dt, size = measure(reply_type, n)
+        print(f"{reply_type.__name__:>16} {n} replies {size / 2**20:9.1f} MiB {size / n:7.0f} bytes/reply {dt / n * 1e6:7.2f} us/reply")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# @Filename: benchmark_unpack.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+'''
+unpack() time on a list of replies like returned by invoke, plain keys, glob patterns and the missing key check.
+
+    python utils/benchmark_unpack.py [replies] [keys]
+'''
+
+import sys
+import fnmatch
+from time import perf_counter
+
+from cluplus.proxy import ProxyDict, ProxyListOfDicts, unpack
+
+
+def replies(n, k):
+    return ProxyListOfDicts([ProxyDict({f"{side}.key{j}": j for side in ("east", "west") for j in range(k)}) for i in range(n)])
+
+
+def unpack_fnmatch(data, *keys, exception_on_missing_keys=False):
+    rkeys = [k for r in data for k in list(r.keys())]
+    if exception_on_missing_keys:
+        bkeys = [k for k in keys if not fnmatch.filter(rkeys, k)]
+    return [d[fn] for k in keys for d in data for fn in fnmatch.filter(d, k)]
+
+
+def measure(fn, *args, **kwargs):
+    fn(*args, **kwargs)
+    t0 = perf_counter()
+    ret = fn(*args, **kwargs)
+    return perf_counter() - t0, ret
+
+
+def main(n, k):
+    data = replies(n, k)
+    for case, keys in (("plain", [f"east.key{j}" for j in range(0, k, 4)]),
+                       ("glob", ["*.key1", "west.key?"]),
+                       ("missing", ["east.key0", "south.*"])):
+        dt_old, old = measure(unpack_fnmatch, data, *keys, exception_on_missing_keys=True)
+        dt_new, new = measure(unpack, data, *keys, as_seq=True)
+        assert(old == new)
+        print(f"{case:>8} {n} replies {len(keys):3} keys  fnmatch {dt_old * 1e3:9.2f} ms  current {dt_new * 1e3:9.2f} ms  {dt_old / dt_new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, int(sys.argv[2]) if len(sys.argv) > 2 else 40)